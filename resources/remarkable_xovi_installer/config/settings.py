@@ -331,8 +331,8 @@ class AppConfig:
     def get_config_dir(self) -> Path:
         """Get the application configuration directory."""
         # Use the new platform-agnostic utility to get the config directory
-        from ..utils.platform_utils import get_platform_config_dir
-        return get_platform_config_dir('remarkable-xovi-installer')
+        from ..utils.platform_utils import APP_DIR_NAME, get_platform_config_dir
+        return get_platform_config_dir(APP_DIR_NAME)
     
     def get_config_file_path(self) -> Path:
         """Get the path to the configuration file."""
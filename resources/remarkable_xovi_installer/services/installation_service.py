@@ -6,11 +6,16 @@ two-stage installation process, download management, device communication,
 and progress tracking for the complete XOVI + AppLoad + KOReader installation.
 """
 
+import io
 import os
+import re
+import json
+import hashlib
 import time
 import logging
 import tempfile
 import urllib.request
+from urllib.error import HTTPError
 from pathlib import Path
 from typing import Optional, Callable, Dict, Any, List
 from enum import Enum
@@ -23,6 +28,25 @@ from ..models.device import Device
 from ..models.installation_state import InstallationState, InstallationStage, StageStatus
 from ..config.settings import AppConfig
 from ..utils.url_loader import get_url_loader
+from ..utils.platform_utils import APP_DIR_NAME, get_platform_cache_dir
+
+
+# Read size for streamed HTTP downloads; large reads keep syscall and
+# Python loop overhead low on multi-megabyte release assets
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Matches stderr of the (expected) xochitl restart failure after XOVI install
+_XOCHITL_FAIL_RE = re.compile(r"failed|job for xochitl\.service failed", re.IGNORECASE)
+
+# Static literm.xovi manifest uploaded alongside the literm extension
+_LITERM_XOVI_BYTES = (
+    b"version         0.1.0\n"
+    b"\n"
+    b"depends-on      qt-resource-rebuilder:0.3.0\n"
+    b"import?         qt-resource-rebuilder$qmldiff_add_external_diff\n"
+    b"resource        qmldiff:literm.qmd\n"
+    b"\n"
+)
 
 
 class InstallationType(Enum):
@@ -80,6 +104,9 @@ class InstallationService:
         # Download URLs from config - will be updated based on device architecture
         self.download_urls = {}
         self._update_urls_for_device()
+        
+        # rm-literm URLs per device architecture
+        self._literm_urls = self._resolve_literm_urls()
     
     def set_progress_callback(self, callback: Callable[[InstallationProgress], None]) -> None:
         """Set progress callback for installation updates."""
@@ -123,6 +150,21 @@ class InstallationService:
             # Fallback to hardcoded URL if weblist loading fails
             return "https://github.com/asivery/rm-xovi-extensions/releases/latest/download/appload.so"
     
+    def _resolve_literm_urls(self) -> Dict[str, tuple]:
+        """Resolve rm-literm binary and QMD URLs for each supported architecture."""
+        binary_template = "https://github.com/asivery/rm-literm/releases/latest/download/{literm_filename}"
+        qmd_url = "https://raw.githubusercontent.com/asivery/rm-literm/master/literm.qmd"
+        try:
+            additional_urls = get_url_loader().get_additional_urls()
+            binary_template = additional_urls.get("literm_binary", binary_template)
+            qmd_url = additional_urls.get("literm_qmd", qmd_url)
+        except Exception:
+            pass  # Fall back to hardcoded URLs if weblist loading fails
+        
+        aarch64 = (binary_template.format(literm_filename="literm-aarch64.so"), qmd_url)
+        arm32 = (binary_template.format(literm_filename="literm-arm32.so"), qmd_url)
+        return {"aarch64": aarch64, "armv7l": arm32, "arm": arm32}
+    
     def _log_output(self, message: str) -> None:
         """Log output message."""
         self._logger.info(message)
@@ -980,7 +1022,7 @@ echo "XOVI hashtable rebuild completed successfully!"'''
                 self._log_output("Installation is SUCCESSFUL - device needs power button reboot")
                 return True
             # Check if this is the expected "Job for xochitl.service failed" error
-            elif "job for xochitl.service failed" in result.stderr.lower() or "failed" in result.stderr.lower():
+            elif _XOCHITL_FAIL_RE.search(result.stderr or ""):
                 self._log_output("Expected: XOVI activation caused xochitl restart failure - this is normal")
                 self._log_output("XOVI has been activated but requires a HARD REBOOT to function properly")
                 self._log_output("Installation is SUCCESSFUL - device needs power button reboot")
@@ -1310,6 +1352,124 @@ MAIN_SCRIPT_EOF
             # Don't fail installation for ethernet fix issues
             self._log_output(f"USB ethernet safety fix encountered error (non-fatal): {e}")
 
+    def _fetch_published_sha256(self, url: str) -> Optional[str]:
+        """
+        Fetch the SHA-256 sidecar (``<url>.sha256``) published for a release asset.
+
+        Returns:
+            Lowercase hex digest, or None if no sidecar is published
+        """
+        request = urllib.request.Request(url + ".sha256")
+        request.add_header('User-Agent', 'freeMarkable/1.0')
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                content = response.read(1024).decode('ascii', errors='replace').split()
+        except Exception:
+            return None
+        
+        if content and len(content[0]) == 64:
+            return content[0].lower()
+        return None
+
+    def _cached_download(self, url: str, dest: Path,
+                         expected_sha256: Optional[str] = None) -> Path:
+        """
+        Download a file using HTTP conditional GET against a local cache.
+
+        The ETag/Last-Modified headers of the previous fetch are stored in a
+        JSON sidecar next to ``dest``; when the server answers 304 the cached
+        file is reused and no body is transferred. The SHA-256 digest is
+        computed while the body streams to disk and recorded in the sidecar.
+
+        Args:
+            url: URL to download from
+            dest: Cache location for the downloaded file
+            expected_sha256: Optional digest the file must match
+
+        Returns:
+            Path to the up-to-date local file
+
+        Raises:
+            ValueError: If the file does not match ``expected_sha256``
+        """
+        meta_path = dest.with_name(dest.name + ".meta.json")
+        request = urllib.request.Request(url)
+        request.add_header('User-Agent', 'freeMarkable/1.0')
+        
+        meta: Dict[str, Any] = {}
+        if dest.exists() and meta_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text())
+                if meta.get("url") == url and meta.get("sha256"):
+                    if meta.get("etag"):
+                        request.add_header('If-None-Match', meta["etag"])
+                    if meta.get("last_modified"):
+                        request.add_header('If-Modified-Since', meta["last_modified"])
+            except (OSError, ValueError):
+                meta = {}  # Corrupt metadata - fall through to a full download
+        
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                digest = hashlib.sha256()
+                # Stage in a temporary directory so an interrupted download never
+                # replaces a good cached copy; it is removed even on failure
+                with tempfile.TemporaryDirectory(prefix="literm_install_", dir=dest.parent) as temp_dir:
+                    part_path = Path(temp_dir) / dest.name
+                    with open(part_path, 'wb') as f:
+                        while True:
+                            chunk = response.read(_DOWNLOAD_CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            digest.update(chunk)
+                            f.write(chunk)
+                    os.replace(part_path, dest)
+                meta = {
+                    "url": url,
+                    "etag": response.headers.get('ETag'),
+                    "last_modified": response.headers.get('Last-Modified'),
+                    "sha256": digest.hexdigest(),
+                }
+        except HTTPError as e:
+            if e.code != 304:
+                raise
+            self._logger.info(f"Using cached {dest.name} (not modified)")
+        else:
+            try:
+                meta_path.write_text(json.dumps(meta))
+            except OSError as e:
+                self._logger.debug(f"Could not write download cache metadata: {e}")
+        
+        if expected_sha256 and meta.get("sha256") != expected_sha256:
+            dest.unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+            raise ValueError(f"Checksum validation failed for {dest.name}. "
+                             f"Expected: {expected_sha256}, Got: {meta.get('sha256')}")
+        
+        return dest
+
+    def _literm_matches_remote(self, expected_sha256: Optional[str]) -> bool:
+        """Check whether the device already has this literm build installed."""
+        if not expected_sha256:
+            return False
+        
+        result = self.network_service.execute_command(
+            "test -f /home/root/xovi/extensions.d/literm.xovi && "
+            "test -f /home/root/xovi/extensions.d/literm.qmd && "
+            "sha256sum /home/root/xovi/extensions.d/literm.so"
+        )
+        if not result.success or not result.stdout.strip():
+            return False
+        return result.stdout.split()[0].lower() == expected_sha256
+
+    def _cached_sha256(self, dest: Path) -> Optional[str]:
+        """Get the SHA-256 digest recorded for a cached download."""
+        try:
+            meta = json.loads(dest.with_name(dest.name + ".meta.json").read_text())
+            return meta.get("sha256")
+        except (OSError, ValueError):
+            return None
+
     def install_literm_only(self, progress_callback=None):
         """Install rm-literm terminal emulator only"""
         try:
@@ -1333,68 +1493,58 @@ MAIN_SCRIPT_EOF
                 progress_callback("Detecting device architecture...", 20)
             
             # Detect device architecture
-            arch_result = self.network_service.execute_command("uname -m")
-            if not arch_result.success:
+            arch = self.network_service.get_device_architecture()
+            if not arch:
                 raise Exception("Failed to detect device architecture")
             
-            arch = arch_result.stdout.strip()
             self._logger.info(f"Detected device architecture: {arch}")
             
-            # Map architecture to release filename
-            if arch == "aarch64":
-                literm_filename = "literm-aarch64.so"
-            elif arch in ["armv7l", "arm"]:
-                literm_filename = "literm-arm32.so"
-            else:
+            # Architecture-specific URLs are resolved once at service init
+            if arch not in self._literm_urls:
                 raise Exception(f"Unsupported architecture: {arch}")
+            download_url, qmd_url = self._literm_urls[arch]
+            literm_filename = download_url.rsplit("/", 1)[-1]
             
             if progress_callback:
                 progress_callback(f"Downloading rm-literm for {arch}...", 30)
             
-            # Download the appropriate binary from GitHub releases using dynamic URLs
-            try:
-                url_loader = get_url_loader()
-                additional_urls = url_loader.get_additional_urls()
-                download_url_template = additional_urls.get("literm_binary", "https://github.com/asivery/rm-literm/releases/latest/download/{literm_filename}")
-                download_url = download_url_template.format(literm_filename=literm_filename)
-                qmd_url = additional_urls.get("literm_qmd", "https://raw.githubusercontent.com/asivery/rm-literm/master/literm.qmd")
-            except Exception:
-                # Fallback to hardcoded URLs if weblist loading fails
-                download_url = f"https://github.com/asivery/rm-literm/releases/latest/download/{literm_filename}"
-                qmd_url = "https://raw.githubusercontent.com/asivery/rm-literm/master/literm.qmd"
-            
-            # Create temporary directory for downloads
-            temp_dir = "/tmp/literm_install"
-            os.makedirs(temp_dir, exist_ok=True)
+            # Downloads are cached per architecture so repeat installs only
+            # transfer files that changed upstream
+            cache_dir = get_platform_cache_dir(APP_DIR_NAME) / 'literm' / arch
+            
+            # Skip the whole download/upload/restart cycle if this release is
+            # already on the device
+            published_sha256 = self._fetch_published_sha256(download_url)
+            if self._literm_matches_remote(published_sha256):
+                self._logger.info("rm-literm is already up to date on the device")
+                if progress_callback:
+                    progress_callback("rm-literm already installed, skipping", 100)
+                return True
             
             # Download the binary
-            literm_local_path = os.path.join(temp_dir, "literm.so")
-            
             try:
-                urllib.request.urlretrieve(download_url, literm_local_path)
-                self._logger.info(f"Downloaded {literm_filename} from GitHub releases")
+                literm_local_path = self._cached_download(
+                    download_url, cache_dir / "literm.so",
+                    expected_sha256=published_sha256
+                )
+                self._logger.info(f"Fetched {literm_filename} from GitHub releases")
             except Exception as e:
                 raise Exception(f"Failed to download rm-literm binary: {str(e)}")
             
+            # Without a published checksum, compare against the cached digest
+            if not published_sha256 and self._literm_matches_remote(self._cached_sha256(literm_local_path)):
+                self._logger.info("rm-literm is already up to date on the device")
+                if progress_callback:
+                    progress_callback("rm-literm already installed, skipping", 100)
+                return True
+            
             # Download the QMD file
-            literm_qmd_path = os.path.join(temp_dir, "literm.qmd")
             try:
-                urllib.request.urlretrieve(qmd_url, literm_qmd_path)
-                self._logger.info("Downloaded literm.qmd from GitHub repository")
+                literm_qmd_path = self._cached_download(qmd_url, cache_dir / "literm.qmd")
+                self._logger.info("Fetched literm.qmd from GitHub repository")
             except Exception as e:
                 raise Exception(f"Failed to download literm.qmd: {str(e)}")
             
-            # Create the .xovi file locally based on the real structure
-            literm_xovi_path = os.path.join(temp_dir, "literm.xovi")
-            with open(literm_xovi_path, 'w') as f:
-                f.write("""version         0.1.0
-
-depends-on      qt-resource-rebuilder:0.3.0
-import?         qt-resource-rebuilder$qmldiff_add_external_diff
-resource        qmldiff:literm.qmd
-
-""")
-            
             if progress_callback:
                 progress_callback("Uploading rm-literm files...", 60)
             
@@ -1402,32 +1552,20 @@ resource        qmldiff:literm.qmd
             if not self.network_service.upload_file(literm_local_path, "/home/root/xovi/extensions.d/literm.so"):
                 raise Exception("Failed to upload literm.so")
             
-            if not self.network_service.upload_file(literm_xovi_path, "/home/root/xovi/extensions.d/literm.xovi"):
+            if not self.network_service.upload_stream(io.BytesIO(_LITERM_XOVI_BYTES), "/home/root/xovi/extensions.d/literm.xovi"):
                 raise Exception("Failed to upload literm.xovi")
             
             if not self.network_service.upload_file(literm_qmd_path, "/home/root/xovi/extensions.d/literm.qmd"):
                 raise Exception("Failed to upload literm.qmd")
             
             if progress_callback:
-                progress_callback("Setting permissions...", 80)
-            
-            # Set permissions
-            self.network_service.execute_command("chmod +x /home/root/xovi/extensions.d/literm.so")
+                progress_callback("Setting permissions and restarting XOVI service...", 80)
             
-            if progress_callback:
-                progress_callback("Restarting XOVI service...", 90)
-            
-            # Restart XOVI to load the new extension
-            self.network_service.execute_command("systemctl restart xochitl")
-            
-            # Clean up temporary files
-            try:
-                os.remove(literm_local_path)
-                os.remove(literm_xovi_path)
-                os.remove(literm_qmd_path)
-                os.rmdir(temp_dir)
-            except:
-                pass  # Clean up is not critical
+            # Set permissions and restart XOVI to load the new extension in a single
+            # exec; ';' keeps the restart running even if chmod reports an error
+            self.network_service.execute_command(
+                "chmod +x /home/root/xovi/extensions.d/literm.so; systemctl restart xochitl"
+            )
             
             if progress_callback:
                 progress_callback("rm-literm installation complete!", 100)
@@ -1477,7 +1615,7 @@ resource        qmldiff:literm.qmd
                     self._log_output("IMPORTANT: XOVI requires a HARD REBOOT (power button) to fully activate")
                     self._log_output("Installation is SUCCESSFUL - please reboot device with power button")
                 # Check for standard xochitl service failure (also expected with XOVI)
-                elif "failed" in restart_result.stderr.lower() or "job for xochitl.service failed" in restart_result.stderr.lower():
+                elif _XOCHITL_FAIL_RE.search(restart_result.stderr or ""):
                     self._log_output("Expected: xochitl service restart failed - this is normal with XOVI installation")
                     self._log_output("CRITICAL: XOVI requires a HARD REBOOT to activate properly")
                     self._log_output("Installation is SUCCESSFUL but device needs power button reboot")
@@ -1486,9 +1624,10 @@ resource        qmldiff:literm.qmd
                     self._log_output(f"Unexpected restart error (exit code: {restart_result.exit_code}): {restart_result.stderr or 'No error details'}")
                     self._log_output("Installation may still be successful - try a hard reboot")
                 
-                # Apply ethernet fix after restart attempt (connection may have been disrupted)
-                self._log_output("Re-applying USB ethernet fix to restore connection...")
-                self._apply_ethernet_safety_fix()
+                # Re-apply ethernet fix only if the restart actually disrupted the connection
+                if restart_result.exit_code == -1 or not self.network_service.is_alive():
+                    self._log_output("Re-applying USB ethernet fix to restore connection...")
+                    self._apply_ethernet_safety_fix()
                 
                 # Installation is still successful - the hard reboot popup will handle the rest
                 return True
@@ -1515,10 +1654,10 @@ def get_installation_service() -> InstallationService:
     Raises:
         RuntimeError: If installation service hasn't been initialized
     """
-    global _global_installation_service
-    if _global_installation_service is None:
+    service = _global_installation_service
+    if service is None:
         raise RuntimeError("Installation service not initialized. Call init_installation_service() first.")
-    return _global_installation_service
+    return service
 
 
 def init_installation_service(config: AppConfig, network_service: NetworkService,
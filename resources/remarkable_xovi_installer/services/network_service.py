@@ -6,13 +6,21 @@ remote command execution, and file transfer with progress tracking.
 """
 
 import os
+import re
+import mmap
+import queue
+import posixpath
+import shlex
+import select
 import logging
+import tarfile
 import threading
 import time
 from pathlib import Path
-from typing import Optional, Callable, Dict, Any, List, Union, Tuple
+from typing import Optional, Callable, Dict, Any, List, Union, Tuple, BinaryIO
 from dataclasses import dataclass
 from enum import Enum
+from functools import cached_property
 import paramiko
 from paramiko import SSHClient, SFTPClient
 from paramiko.ssh_exception import (
@@ -25,6 +33,30 @@ import socket
 from concurrent.futures import ThreadPoolExecutor, Future
 
 
+# Largest SFTP read/write request payload; OpenSSH's sftp-server rejects
+# messages over 256 KiB including headers
+_SFTP_MAX_REQUEST_SIZE = 255 * 1024
+
+# SSH channel flow control: a large window keeps more SFTP data in flight on
+# high-latency links (USB-over-IP, Wi-Fi) than paramiko's 2 MiB default
+_SSH_WINDOW_SIZE = 64 * 1024 * 1024
+_SSH_MAX_PACKET_SIZE = 256 * 1024
+
+# Seconds after a successful exec during which execute_command trusts the
+# connection without re-checking the transport
+_HEALTHY_CONNECTION_WINDOW = 1.0
+
+# Minimum seconds between transfer progress callbacks (~30 Hz)
+_PROGRESS_INTERVAL = 0.033
+
+# Directories per batched 'mkdir -p' exec, keeping well under argv limits
+_MKDIR_BATCH_SIZE = 100
+
+# Marker printed after each command of a batched script, followed by its exit code
+_SCRIPT_SEPARATOR = "---FREEMARKABLE-SEP---"
+_SCRIPT_SEPARATOR_RE = re.compile(r"\n?" + re.escape(_SCRIPT_SEPARATOR) + r"(\d+)\n")
+
+
 class ConnectionStatus(Enum):
     """SSH connection status."""
     DISCONNECTED = "disconnected"
@@ -53,7 +85,7 @@ class CommandResult:
         """Check if command executed successfully."""
         return self.exit_code == 0
     
-    @property
+    @cached_property
     def output(self) -> str:
         """Get combined stdout/stderr output."""
         return f"{self.stdout}\n{self.stderr}".strip()
@@ -81,7 +113,7 @@ class TransferProgress:
     @property
     def speed_bytes_per_second(self) -> float:
         """Get transfer speed in bytes per second."""
-        elapsed = time.time() - self.start_time
+        elapsed = time.monotonic() - self.start_time
         if elapsed > 0:
             return self.bytes_transferred / elapsed
         return 0.0
@@ -96,6 +128,30 @@ class TransferProgress:
         return None
 
 
+def _root_owned(tarinfo: tarfile.TarInfo) -> tarfile.TarInfo:
+    """Record a tar entry as owned by root instead of the local user."""
+    tarinfo.uid = tarinfo.gid = 0
+    tarinfo.uname = tarinfo.gname = "root"
+    return tarinfo
+
+
+class _ChannelWriter:
+    """Write-only file object that sends data over an SSH channel."""
+    
+    def __init__(self, channel: paramiko.Channel,
+                 progress_callback: Optional[Callable[[int], None]] = None):
+        self.channel = channel
+        self.progress_callback = progress_callback
+        self.bytes_written = 0
+    
+    def write(self, data: bytes) -> int:
+        self.channel.sendall(data)
+        self.bytes_written += len(data)
+        if self.progress_callback:
+            self.progress_callback(self.bytes_written)
+        return len(data)
+
+
 class NetworkService:
     """
     Network service for SSH/SCP operations with the reMarkable device.
@@ -107,7 +163,8 @@ class NetworkService:
     def __init__(self, connection_timeout: int = 10, 
                  max_retries: int = 3,
                  retry_delay: int = 2,
-                 keepalive_interval: int = 30):
+                 keepalive_interval: int = 30,
+                 transfer_block_size: int = _SFTP_MAX_REQUEST_SIZE):
         """
         Initialize network service.
         
@@ -116,11 +173,13 @@ class NetworkService:
             max_retries: Maximum connection retry attempts
             retry_delay: Delay between retry attempts in seconds
             keepalive_interval: SSH keepalive interval in seconds
+            transfer_block_size: SFTP transfer block size in bytes
         """
         self.connection_timeout = connection_timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.keepalive_interval = keepalive_interval
+        self.transfer_block_size = transfer_block_size
         
         # Connection state
         self.ssh_client: Optional[SSHClient] = None
@@ -142,6 +201,18 @@ class NetworkService:
         self.executor = ThreadPoolExecutor(max_workers=4)
         self._connection_lock = threading.Lock()
         
+        # Extra SFTP channels for parallel transfers on the executor
+        self._sftp_pool: "queue.Queue[SFTPClient]" = queue.Queue()
+        
+        # Monotonic time of the last exec that opened a channel successfully
+        self._last_healthy_ts = 0.0
+        
+        # Hostnames whose known_hosts entries were already cleared this session
+        self._host_keys_cleared: set = set()
+        
+        # Device architecture keyed by host key fingerprint
+        self._architecture_cache: Dict[bytes, str] = {}
+        
         self._logger = logging.getLogger(__name__)
     
     def set_connection_details(self, hostname: str, password: str, 
@@ -175,10 +246,20 @@ class NetworkService:
     
     def is_connected(self) -> bool:
         """Check if SSH connection is active."""
-        return (self.connection_status == ConnectionStatus.CONNECTED and 
-                self.ssh_client is not None and 
-                self.ssh_client.get_transport() is not None and
-                self.ssh_client.get_transport().is_active())
+        if self.connection_status is not ConnectionStatus.CONNECTED or self.ssh_client is None:
+            return False
+        transport = self.ssh_client.get_transport()
+        return transport is not None and transport.is_active()
+    
+    def is_alive(self) -> bool:
+        """
+        Check whether the SSH transport is still up.
+        
+        Unlike is_connected() this ignores the tracked connection status and
+        only inspects the in-process transport state; no network traffic.
+        """
+        transport = self.ssh_client.get_transport() if self.ssh_client else None
+        return transport is not None and transport.is_active()
     
     def connect(self, force_reconnect: bool = False) -> bool:
         """
@@ -205,27 +286,10 @@ class NetworkService:
             if self.ssh_client:
                 self.disconnect()
             
-            # Clear any existing host keys for this hostname BEFORE attempting connection
-            # This prevents Paramiko from loading conflicting keys that cause verification failures
-            known_hosts_path = os.path.expanduser('~/.ssh/known_hosts')
-            if os.path.exists(known_hosts_path):
-                try:
-                    # Remove existing entries for this hostname
-                    with open(known_hosts_path, 'r') as f:
-                        lines = f.readlines()
-                    
-                    filtered_lines = []
-                    for line in lines:
-                        if not line.startswith(self.hostname + ' ') and not line.startswith(self.hostname + ','):
-                            filtered_lines.append(line)
-                    
-                    # Only rewrite if we found entries to remove
-                    if len(filtered_lines) < len(lines):
-                        with open(known_hosts_path, 'w') as f:
-                            f.writelines(filtered_lines)
-                        self._logger.debug(f"Cleared conflicting host key entries for {self.hostname}")
-                except Exception as e:
-                    self._logger.debug(f"Could not clear host key entries: {e}")
+            # Clear stale host keys once per hostname; reconnects skip the file I/O
+            if self.hostname not in self._host_keys_cleared:
+                self._clear_known_host_entries()
+                self._host_keys_cleared.add(self.hostname)
             
             # Attempt connection with retries
             for attempt in range(self.max_retries):
@@ -249,13 +313,17 @@ class NetworkService:
                         banner_timeout=self.connection_timeout,
                         auth_timeout=self.connection_timeout,
                         look_for_keys=False,          # Don't use SSH keys
-                        allow_agent=False             # Don't use SSH agent
+                        allow_agent=False,            # Don't use SSH agent
+                        sock=self._open_socket()
                     )
                     
                     # Set keepalive to prevent connection drops
                     transport = self.ssh_client.get_transport()
                     if transport:
                         transport.set_keepalive(self.keepalive_interval)
+                        # Channels opened from here on (exec and SFTP) use these sizes
+                        transport.default_window_size = _SSH_WINDOW_SIZE
+                        transport.default_max_packet_size = _SSH_MAX_PACKET_SIZE
                     
                     # Create SFTP client for file operations
                     self.sftp_client = self.ssh_client.open_sftp()
@@ -311,9 +379,52 @@ class NetworkService:
             
             return False
     
+    def _clear_known_host_entries(self) -> None:
+        """
+        Remove ~/.ssh/known_hosts entries for the current hostname.
+        
+        reMarkable devices often regenerate their host keys, so stale entries
+        would otherwise cause verification failures.
+        """
+        known_hosts_path = os.path.expanduser('~/.ssh/known_hosts')
+        if os.path.exists(known_hosts_path):
+            try:
+                # Remove existing entries for this hostname
+                with open(known_hosts_path, 'r') as f:
+                    lines = f.readlines()
+                
+                prefixes = (self.hostname + ' ', self.hostname + ',')
+                filtered_lines = [line for line in lines if not line.startswith(prefixes)]
+                
+                # Only rewrite if we found entries to remove
+                if len(filtered_lines) < len(lines):
+                    with open(known_hosts_path, 'w') as f:
+                        f.write(''.join(filtered_lines))
+                    self._logger.debug(f"Cleared conflicting host key entries for {self.hostname}")
+            except Exception as e:
+                self._logger.debug(f"Could not clear host key entries: {e}")
+    
+    def _open_socket(self) -> socket.socket:
+        """
+        Open the TCP connection used by the SSH transport.
+        
+        Disables Nagle so interactive commands are not delayed. Socket buffer
+        sizes are left to the OS: setting them would turn off Linux receive
+        autotuning, which grows well past what rmem_max allows.
+        """
+        sock = socket.create_connection((self.hostname, self.port), timeout=self.connection_timeout)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError as e:
+            # The connection is still usable without the option
+            self._logger.debug(f"Could not tune SSH socket options: {e}")
+        return sock
+    
     def disconnect(self) -> None:
         """Close SSH and SFTP connections."""
         with self._connection_lock:
+            self._close_sftp_pool()
+            
             if self.sftp_client:
                 try:
                     self.sftp_client.close()
@@ -329,6 +440,7 @@ class NetworkService:
                 self.ssh_client = None
             
             self.connection_status = ConnectionStatus.DISCONNECTED
+            self._last_healthy_ts = 0.0
             self._logger.debug("SSH connection closed")
     
     def test_connection(self) -> bool:
@@ -369,7 +481,8 @@ class NetworkService:
         Returns:
             CommandResult with execution details
         """
-        if not self.is_connected():
+        # Skip the transport check right after a successful exec
+        if time.monotonic() - self._last_healthy_ts >= _HEALTHY_CONNECTION_WINDOW and not self.is_connected():
             if not self.connect():
                 return CommandResult(
                     command=command,
@@ -380,7 +493,7 @@ class NetworkService:
                 )
         
         self._logger.debug(f"Executing command: {command}")
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
             # Handle None timeout by not setting any timeout at all
@@ -391,42 +504,72 @@ class NetworkService:
                     command,
                     timeout=timeout or self.connection_timeout
                 )
+            self._last_healthy_ts = time.monotonic()
             
             if real_time_output and self.command_output_callback:
-                # Stream output in real-time
-                stdout_data = []
-                stderr_data = []
-                
-                def read_output(stream, data_list, is_stderr=False):
-                    for line in iter(stream.readline, ""):
-                        if line:
-                            data_list.append(line)
-                            if self.command_output_callback:
-                                self.command_output_callback(line.rstrip())
+                # Stream output in real-time from the single channel
+                stdout_buf = bytearray()
+                stderr_buf = bytearray()
+                pending = {False: b"", True: b""}
                 
-                # Start threads to read both streams
-                import threading
-                stdout_thread = threading.Thread(target=read_output, args=(stdout, stdout_data))
-                stderr_thread = threading.Thread(target=read_output, args=(stderr, stderr_data, True))
+                def emit_lines(data: bytes, is_stderr: bool, final: bool = False) -> None:
+                    (stderr_buf if is_stderr else stdout_buf).extend(data)
+                    lines = (pending[is_stderr] + data).split(b"\n")
+                    pending[is_stderr] = b"" if final else lines.pop()
+                    for raw_line in lines:
+                        if final and not raw_line:
+                            continue
+                        self.command_output_callback(
+                            raw_line.decode('utf-8', errors='replace').rstrip()
+                        )
                 
-                stdout_thread.start()
-                stderr_thread.start()
+                channel = stdout.channel
+                # recv() is only called once data is ready, so the channel
+                # timeout never fires here; enforce it as an idle deadline
+                idle_timeout = channel.gettimeout()
+                deadline = time.monotonic() + idle_timeout if idle_timeout else None
+                while True:
+                    select.select([channel], [], [], 0.1)
+                    received = False
+                    while channel.recv_ready():
+                        emit_lines(channel.recv(65536), False)
+                        received = True
+                    while channel.recv_stderr_ready():
+                        emit_lines(channel.recv_stderr(65536), True)
+                        received = True
+                    if (channel.exit_status_ready() and not channel.recv_ready()
+                            and not channel.recv_stderr_ready()):
+                        break
+                    if deadline is not None:
+                        if received:
+                            deadline = time.monotonic() + idle_timeout
+                        elif time.monotonic() >= deadline:
+                            channel.close()
+                            raise socket.timeout()
                 
-                # Wait for command completion
-                exit_code = stdout.channel.recv_exit_status()
+                # Flush any unterminated final lines
+                emit_lines(b"", False, final=True)
+                emit_lines(b"", True, final=True)
                 
-                stdout_thread.join()
-                stderr_thread.join()
+                exit_code = channel.recv_exit_status()
                 
-                stdout_text = "".join(stdout_data)
-                stderr_text = "".join(stderr_data)
+                stdout_text = stdout_buf.decode('utf-8', errors='replace')
+                stderr_text = stderr_buf.decode('utf-8', errors='replace')
             else:
-                # Read all output at once
-                stdout_text = stdout.read().decode('utf-8', errors='replace') if capture_output else ""
-                stderr_text = stderr.read().decode('utf-8', errors='replace') if capture_output else ""
-                exit_code = stdout.channel.recv_exit_status()
+                # Read all output at once straight from the channel and decode once
+                channel = stdout.channel
+                stdout_buf = bytearray()
+                stderr_buf = bytearray()
+                if capture_output:
+                    for chunk in iter(lambda: channel.recv(65536), b""):
+                        stdout_buf += chunk
+                    for chunk in iter(lambda: channel.recv_stderr(65536), b""):
+                        stderr_buf += chunk
+                stdout_text = stdout_buf.decode('utf-8', errors='replace')
+                stderr_text = stderr_buf.decode('utf-8', errors='replace')
+                exit_code = channel.recv_exit_status()
             
-            execution_time = time.time() - start_time
+            execution_time = time.monotonic() - start_time
             
             result = CommandResult(
                 command=command,
@@ -444,17 +587,55 @@ class NetworkService:
             return result
             
         except socket.timeout:
-            execution_time = time.time() - start_time
+            self._last_healthy_ts = 0.0
+            execution_time = time.monotonic() - start_time
             error_msg = f"Command timed out after {timeout or self.connection_timeout} seconds"
             self._logger.error(error_msg)
             return CommandResult(command, -1, "", error_msg, execution_time)
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            self._last_healthy_ts = 0.0
+            execution_time = time.monotonic() - start_time
             error_msg = f"Command execution failed: {e}"
             self._logger.error(error_msg)
             return CommandResult(command, -1, "", error_msg, execution_time)
     
+    def execute_script(self, commands: List[str],
+                       timeout: Optional[int] = None) -> List[CommandResult]:
+        """
+        Execute several independent commands in a single SSH exec.
+        
+        Each command's stdout is delimited by a separator carrying its exit
+        code, so one channel round trip yields a result per command.
+        
+        Args:
+            commands: Shell commands to run in order
+            timeout: Timeout for the whole batch in seconds
+            
+        Returns:
+            One CommandResult per command. stderr is shared by the batch and
+            attached to failed commands only.
+        """
+        script = "\n".join(
+            f"{command}\nprintf '\\n{_SCRIPT_SEPARATOR}%d\\n' $?" for command in commands
+        )
+        batch = self.execute_command(script, timeout=timeout)
+        
+        parts = _SCRIPT_SEPARATOR_RE.split(batch.stdout)
+        results = []
+        for index, command in enumerate(commands):
+            if 2 * index + 1 < len(parts):
+                exit_code = int(parts[2 * index + 1])
+                stdout = parts[2 * index]
+            else:
+                # Batch aborted before reaching this command
+                exit_code = -1
+                stdout = ""
+            stderr = batch.stderr if exit_code != 0 else ""
+            results.append(CommandResult(command, exit_code, stdout, stderr, batch.execution_time))
+        
+        return results
+    
     def upload_file(self, local_path: Union[str, Path], remote_path: str,
                    create_dirs: bool = True) -> bool:
         """
@@ -473,55 +654,222 @@ class NetworkService:
                 self._logger.error("Cannot upload file: not connected")
                 return False
         
-        local_path = Path(local_path)
-        if not local_path.exists():
-            self._logger.error(f"Local file does not exist: {local_path}")
+        local_str = os.fspath(local_path)
+        try:
+            local_file = open(local_str, 'rb')
+        except OSError as e:
+            self._logger.error(f"Cannot open local file {local_str}: {e}")
             return False
         
         try:
             # Create remote directories if needed
             if create_dirs:
-                remote_dir = str(Path(remote_path).parent)
-                if remote_dir != "/":
+                remote_dir = posixpath.dirname(remote_path)
+                if remote_dir not in ("", "/"):
                     self.execute_command(f"mkdir -p '{remote_dir}'")
             
             # Get file size for progress tracking
-            file_size = local_path.stat().st_size
-            transferred = 0
-            start_time = time.time()
+            file_size = os.fstat(local_file.fileno()).st_size
+            start_time = time.monotonic()
             
-            def progress_callback(bytes_transferred: int, total_bytes: int) -> None:
-                nonlocal transferred
-                transferred = bytes_transferred
-                
-                if self.transfer_progress_callback:
-                    progress = TransferProgress(
-                        filename=local_path.name,
-                        bytes_transferred=bytes_transferred,
-                        total_bytes=total_bytes,
-                        start_time=start_time,
-                        is_upload=True
-                    )
-                    self.transfer_progress_callback(progress)
+            self._logger.info(f"Uploading {local_str} to {remote_path}")
             
-            self._logger.info(f"Uploading {local_path} to {remote_path}")
+            with local_file:
+                if file_size > 0:
+                    # Read blocks straight from the page cache instead of
+                    # copying through a buffered file object
+                    with mmap.mmap(local_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        self._pipelined_upload(mapped, remote_path, os.path.basename(local_str), file_size)
+                else:
+                    # Empty files cannot be memory-mapped
+                    self._pipelined_upload(local_file, remote_path, os.path.basename(local_str), file_size)
             
-            # Use SFTP for file transfer with progress callback
-            self.sftp_client.put(
-                str(local_path), 
-                remote_path, 
-                callback=progress_callback
-            )
-            
-            elapsed = time.time() - start_time
+            elapsed = time.monotonic() - start_time
             speed = file_size / elapsed if elapsed > 0 else 0
             self._logger.info(f"Upload completed: {file_size} bytes in {elapsed:.2f}s ({speed:.0f} B/s)")
             
             return True
             
         except Exception as e:
+            local_file.close()
             self._logger.error(f"Upload failed: {e}")
             return False
+
+    def upload_stream(self, fileobj: BinaryIO, remote_path: str,
+                      create_dirs: bool = True) -> bool:
+        """
+        Upload the contents of a file-like object to the remote device.
+
+        Args:
+            fileobj: Readable binary file-like object (e.g. io.BytesIO)
+            remote_path: Remote file path
+            create_dirs: Whether to create remote directories
+
+        Returns:
+            True if upload successful
+        """
+        if not self.is_connected():
+            if not self.connect():
+                self._logger.error("Cannot upload stream: not connected")
+                return False
+
+        try:
+            # Create remote directories if needed
+            if create_dirs:
+                remote_dir = posixpath.dirname(remote_path)
+                if remote_dir not in ("", "/"):
+                    self.execute_command(f"mkdir -p '{remote_dir}'")
+
+            start_time = time.monotonic()
+
+            self._logger.info(f"Uploading stream to {remote_path}")
+
+            size = self._pipelined_upload(fileobj, remote_path, posixpath.basename(remote_path))
+
+            elapsed = time.monotonic() - start_time
+            self._logger.info(f"Upload completed: {size} bytes in {elapsed:.2f}s")
+
+            return True
+
+        except Exception as e:
+            self._logger.error(f"Stream upload failed: {e}")
+            return False
+
+    def _sftp_request_size(self) -> int:
+        """
+        Get the per-request SFTP payload size for this service.
+        
+        paramiko splits reads and writes into 32 KiB requests by default; the
+        limit is raised per file (instance attribute) so other SFTP users in
+        the process are unaffected.
+        """
+        return max(32768, min(self.transfer_block_size, _SFTP_MAX_REQUEST_SIZE))
+    
+    def _transfer_chunk_size(self) -> int:
+        """
+        Get the read/write size for pipelined transfers.
+        
+        Rounded down to a whole number of SFTP requests so paramiko never
+        splits a chunk into a full request plus a small remainder.
+        """
+        request_size = self._sftp_request_size()
+        return max(request_size, self.transfer_block_size // request_size * request_size)
+    
+    def _progress_reporter(self, filename: str, total_bytes: int,
+                           is_upload: bool) -> Callable[..., None]:
+        """
+        Build a throttled transfer progress reporter.
+        
+        The returned function takes the bytes transferred so far and emits
+        a TransferProgress at most every _PROGRESS_INTERVAL seconds, plus the
+        final update when the transfer completes or ``force`` is set. A
+        forced update is skipped if that count was already reported.
+        """
+        start_time = time.monotonic()
+        last_emit = 0.0
+        last_bytes = -1
+        
+        def report(bytes_transferred: int, force: bool = False) -> None:
+            nonlocal last_emit, last_bytes
+            if not self.transfer_progress_callback:
+                return
+            now = time.monotonic()
+            if force:
+                if bytes_transferred == last_bytes:
+                    return
+            elif bytes_transferred != total_bytes and now - last_emit < _PROGRESS_INTERVAL:
+                return
+            last_emit = now
+            last_bytes = bytes_transferred
+            progress = TransferProgress(
+                filename=filename,
+                bytes_transferred=bytes_transferred,
+                total_bytes=total_bytes or bytes_transferred,
+                start_time=start_time,
+                is_upload=is_upload
+            )
+            self.transfer_progress_callback(progress)
+        
+        return report
+    
+    def _pipelined_upload(self, fileobj: BinaryIO, remote_path: str, filename: str,
+                          total_bytes: int = 0, sftp: Optional[SFTPClient] = None) -> int:
+        """
+        Copy a local file object to the remote device with SFTP write pipelining.
+        
+        Pipelined writes are sent without waiting for each server ack, so the
+        transfer runs as a sliding window over the SSH channel instead of
+        stop-and-wait. Acks are collected when the remote file is closed.
+        
+        Args:
+            fileobj: Readable binary file-like object
+            remote_path: Remote file path
+            filename: Name reported in transfer progress
+            total_bytes: Expected size for progress reporting (0 if unknown)
+            sftp: SFTP client to use instead of the shared one
+            
+        Returns:
+            Number of bytes written
+        """
+        report_progress = self._progress_reporter(filename, total_bytes, is_upload=True)
+        transferred = 0
+        sftp = sftp or self.sftp_client
+        
+        with sftp.open(remote_path, 'wb') as remote_file:
+            remote_file.MAX_REQUEST_SIZE = self._sftp_request_size()
+            remote_file.set_pipelined(True)
+            chunk_size = self._transfer_chunk_size()
+            while True:
+                chunk = fileobj.read(chunk_size)
+                if not chunk:
+                    break
+                remote_file.write(chunk)
+                transferred += len(chunk)
+                report_progress(transferred)
+        
+        report_progress(transferred, force=True)
+        return transferred
+    
+    def _pipelined_download(self, remote_path: str, fileobj: BinaryIO, filename: str,
+                            total_bytes: int = 0) -> int:
+        """
+        Copy a remote file to a local file object with concurrent SFTP reads.
+        
+        When the size is known, all block reads are issued up front via
+        readv() so many requests are in flight at once instead of one
+        synchronous read per block.
+        
+        Args:
+            remote_path: Remote file path
+            fileobj: Writable binary file-like object
+            filename: Name reported in transfer progress
+            total_bytes: Remote file size (0 if unknown)
+            
+        Returns:
+            Number of bytes written
+        """
+        report_progress = self._progress_reporter(filename, total_bytes, is_upload=False)
+        transferred = 0
+        
+        block_size = self._transfer_chunk_size()
+        
+        with self.sftp_client.open(remote_path, 'rb') as remote_file:
+            remote_file.MAX_REQUEST_SIZE = self._sftp_request_size()
+            if total_bytes > 0:
+                chunks = remote_file.readv(
+                    [(offset, min(block_size, total_bytes - offset))
+                     for offset in range(0, total_bytes, block_size)]
+                )
+            else:
+                chunks = iter(lambda: remote_file.read(block_size), b"")
+            
+            for chunk in chunks:
+                fileobj.write(chunk)
+                transferred += len(chunk)
+                report_progress(transferred)
+        
+        report_progress(transferred, force=True)
+        return transferred
     
     def download_file(self, remote_path: str, local_path: Union[str, Path],
                      create_dirs: bool = True) -> bool:
@@ -541,12 +889,14 @@ class NetworkService:
                 self._logger.error("Cannot download file: not connected")
                 return False
         
-        local_path = Path(local_path)
+        local_str = os.fspath(local_path)
         
         try:
             # Create local directories if needed
             if create_dirs:
-                local_path.parent.mkdir(parents=True, exist_ok=True)
+                local_dir = os.path.dirname(local_str)
+                if local_dir:
+                    os.makedirs(local_dir, exist_ok=True)
             
             # Get remote file size for progress tracking
             try:
@@ -555,34 +905,16 @@ class NetworkService:
             except Exception:
                 file_size = 0
             
-            transferred = 0
-            start_time = time.time()
+            start_time = time.monotonic()
             
-            def progress_callback(bytes_transferred: int, total_bytes: int) -> None:
-                nonlocal transferred
-                transferred = bytes_transferred
-                
-                if self.transfer_progress_callback:
-                    progress = TransferProgress(
-                        filename=Path(remote_path).name,
-                        bytes_transferred=bytes_transferred,
-                        total_bytes=total_bytes or file_size,
-                        start_time=start_time,
-                        is_upload=False
-                    )
-                    self.transfer_progress_callback(progress)
+            self._logger.info(f"Downloading {remote_path} to {local_str}")
             
-            self._logger.info(f"Downloading {remote_path} to {local_path}")
-            
-            # Use SFTP for file transfer with progress callback
-            self.sftp_client.get(
-                remote_path,
-                str(local_path),
-                callback=progress_callback
-            )
+            with open(local_str, 'wb') as local_file:
+                actual_size = self._pipelined_download(
+                    remote_path, local_file, posixpath.basename(remote_path), file_size
+                )
             
-            elapsed = time.time() - start_time
-            actual_size = local_path.stat().st_size if local_path.exists() else 0
+            elapsed = time.monotonic() - start_time
             speed = actual_size / elapsed if elapsed > 0 else 0
             self._logger.info(f"Download completed: {actual_size} bytes in {elapsed:.2f}s ({speed:.0f} B/s)")
             
@@ -615,27 +947,167 @@ class NetworkService:
             return False
         
         try:
-            # Create remote directory
-            self.execute_command(f"mkdir -p '{remote_dir}'")
-            
-            # Upload files
-            success = True
-            for item in local_dir.iterdir():
-                if item.is_file():
-                    remote_file = f"{remote_dir}/{item.name}"
-                    if not self.upload_file(item, remote_file):
-                        success = False
-                elif item.is_dir() and recursive:
-                    remote_subdir = f"{remote_dir}/{item.name}"
-                    if not self.upload_directory(item, remote_subdir, recursive):
-                        success = False
-            
-            return success
+            # Stream the whole tree through one tar pipe; fall back to per-file
+            # SFTP uploads if the device cannot extract it
+            if self._upload_directory_tar(local_dir, remote_dir, recursive):
+                return True
+            
+            self._logger.info("tar upload unavailable, falling back to per-file SFTP upload")
+            return self._upload_directory_sftp(local_dir, remote_dir, recursive)
             
         except Exception as e:
             self._logger.error(f"Directory upload failed: {e}")
             return False
     
+    def _upload_directory_tar(self, local_dir: Path, remote_dir: str,
+                              recursive: bool = True) -> bool:
+        """
+        Upload a directory as a tar stream extracted on the device.
+        
+        One exec channel carries every file, so the cost no longer grows
+        with a round trip per file as it does over SFTP.
+        
+        Entries are stored owned by root, as the SFTP path creates them, and
+        symlinks are followed so their targets are uploaded as regular files.
+        
+        Returns:
+            True if the remote tar exited successfully
+        """
+        quoted_dir = shlex.quote(remote_dir)
+        channel = None
+        try:
+            channel = self.ssh_client.get_transport().open_session()
+            channel.exec_command(f"mkdir -p {quoted_dir} && tar -xf - -C {quoted_dir}")
+            
+            if recursive:
+                total_bytes = sum(f.stat().st_size for f in local_dir.rglob('*') if f.is_file())
+            else:
+                total_bytes = sum(f.stat().st_size for f in local_dir.iterdir() if f.is_file())
+            start_time = time.monotonic()
+            report_progress = self._progress_reporter(local_dir.name, total_bytes, is_upload=True)
+            
+            self._logger.info(f"Uploading {local_dir} to {remote_dir} via tar stream")
+            
+            writer = _ChannelWriter(
+                channel, lambda written: report_progress(min(written, total_bytes))
+            )
+            with tarfile.open(fileobj=writer, mode='w|', dereference=True) as tar:
+                if recursive:
+                    tar.add(str(local_dir), arcname='.', filter=_root_owned)
+                else:
+                    for item in local_dir.iterdir():
+                        if item.is_file():
+                            tar.add(str(item), arcname=item.name, filter=_root_owned)
+            
+            channel.shutdown_write()
+            exit_code = channel.recv_exit_status()
+            if exit_code != 0:
+                stderr = channel.recv_stderr(4096).decode('utf-8', errors='replace')
+                self._logger.warning(f"Remote tar failed with exit code {exit_code}: {stderr}")
+                return False
+            
+            elapsed = time.monotonic() - start_time
+            self._logger.info(f"Directory upload completed: {writer.bytes_written} bytes in {elapsed:.2f}s")
+            return True
+            
+        except (SSHException, OSError) as e:
+            self._logger.warning(f"tar stream upload failed: {e}")
+            return False
+        finally:
+            if channel is not None:
+                channel.close()
+    
+    def _upload_directory_sftp(self, local_dir: Path, remote_dir: str,
+                               recursive: bool = True) -> bool:
+        """Upload a directory file by file, spreading files across the executor."""
+        remote_dirs = [remote_dir]
+        files: List[Tuple[Path, str]] = []
+        self._collect_directory_uploads(local_dir, remote_dir, recursive, remote_dirs, files)
+        
+        # Create every remote directory up front in as few execs as possible,
+        # so the individual uploads need no mkdir of their own
+        for i in range(0, len(remote_dirs), _MKDIR_BATCH_SIZE):
+            batch = remote_dirs[i:i + _MKDIR_BATCH_SIZE]
+            result = self.execute_command("mkdir -p " + " ".join(shlex.quote(d) for d in batch))
+            if not result.success:
+                self._logger.error(f"Failed to create remote directories: {result.stderr}")
+                return False
+        
+        futures = [self.executor.submit(self._upload_one, local_file, remote_file)
+                   for local_file, remote_file in files]
+        
+        success = True
+        for future in futures:
+            if not future.result():
+                success = False
+        
+        return success
+    
+    def _collect_directory_uploads(self, local_dir: Path, remote_dir: str, recursive: bool,
+                                   remote_dirs: List[str], files: List[Tuple[Path, str]]) -> None:
+        """Collect the remote directories and file uploads needed for a directory tree."""
+        for item in local_dir.iterdir():
+            if item.is_file():
+                files.append((item, f"{remote_dir}/{item.name}"))
+            elif item.is_dir() and recursive:
+                remote_subdir = f"{remote_dir}/{item.name}"
+                remote_dirs.append(remote_subdir)
+                self._collect_directory_uploads(item, remote_subdir, recursive, remote_dirs, files)
+    
+    def _upload_one(self, local_path: Path, remote_path: str) -> bool:
+        """
+        Upload a single file on its own SFTP channel.
+        
+        Channels share the existing transport, so parallel uploads from the
+        executor do not serialize on the main SFTP client.
+        """
+        sftp = self._acquire_sftp()
+        try:
+            with open(local_path, 'rb') as local_file:
+                self._pipelined_upload(local_file, remote_path, local_path.name,
+                                       os.fstat(local_file.fileno()).st_size, sftp=sftp)
+            return True
+        except Exception as e:
+            self._logger.error(f"Upload of {local_path} failed: {e}")
+            return False
+        finally:
+            self._release_sftp(sftp)
+    
+    def _acquire_sftp(self) -> SFTPClient:
+        """
+        Take an SFTP client for a worker thread from the pool.
+        
+        Clients are separate channels on the shared transport and are reused
+        across transfers; a new one is opened when the pool is empty.
+        """
+        transport = self.ssh_client.get_transport()
+        while True:
+            try:
+                sftp = self._sftp_pool.get_nowait()
+            except queue.Empty:
+                return SFTPClient.from_transport(transport)
+            
+            channel = sftp.get_channel()
+            if channel.get_transport() is transport and not channel.closed:
+                return sftp
+            sftp.close()  # Left over from a previous connection
+    
+    def _release_sftp(self, sftp: SFTPClient) -> None:
+        """Return an SFTP client to the pool."""
+        self._sftp_pool.put(sftp)
+    
+    def _close_sftp_pool(self) -> None:
+        """Close all pooled SFTP clients."""
+        while True:
+            try:
+                sftp = self._sftp_pool.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                sftp.close()
+            except Exception:
+                pass
+    
     def file_exists(self, remote_path: str) -> bool:
         """Check if a file exists on the remote device."""
         if not self.is_connected():
@@ -649,41 +1121,105 @@ class NetworkService:
         except Exception:
             return False
     
+    def read_remote_file(self, remote_path: str) -> bytes:
+        """
+        Read a small remote file over the existing SFTP session.
+        
+        Args:
+            remote_path: Remote file path
+            
+        Returns:
+            File contents
+            
+        Raises:
+            ConnectionError: If not connected to the device
+            IOError: If the file cannot be read
+        """
+        if not self.is_connected():
+            if not self.connect():
+                raise ConnectionError(f"Not connected to device: {self.last_error}")
+        
+        with self.sftp_client.open(remote_path, 'rb') as remote_file:
+            return remote_file.read()
+    
+    def _get_device_fingerprint(self) -> Optional[bytes]:
+        """Get the host key fingerprint identifying the connected device."""
+        try:
+            return self.ssh_client.get_transport().get_remote_server_key().get_fingerprint()
+        except Exception:
+            return None
+    
+    def files_exist(self, remote_paths: List[str]) -> Dict[str, bool]:
+        """
+        Check whether several paths exist on the remote device in one exec.
+        
+        Args:
+            remote_paths: Remote paths to test
+            
+        Returns:
+            Mapping of each path to whether it exists
+        """
+        if not remote_paths:
+            return {}
+        if not self.is_connected():
+            return {path: False for path in remote_paths}
+        
+        command = ("for p in " + " ".join(shlex.quote(p) for p in remote_paths) +
+                   '; do [ -e "$p" ] && echo 1 || echo 0; done')
+        result = self.execute_command(command)
+        flags = result.stdout.split() if result.success else []
+        
+        if len(flags) != len(remote_paths):
+            return {path: False for path in remote_paths}
+        return {path: flag == "1" for path, flag in zip(remote_paths, flags)}
+    
     def get_device_architecture(self) -> Optional[str]:
-        """Get device architecture via uname command."""
-        result = self.execute_command("uname -m")
-        if result.success:
-            return result.stdout.strip()
-        return None
+        """
+        Get device architecture, memoized per device.
+        
+        Reads /proc/sys/kernel/arch over SFTP, which avoids opening an exec
+        channel, and falls back to ``uname -m`` on older kernels.
+        """
+        if not self.is_connected():
+            if not self.connect():
+                return None
+        
+        fingerprint = self._get_device_fingerprint()
+        if fingerprint is not None and fingerprint in self._architecture_cache:
+            return self._architecture_cache[fingerprint]
+        
+        try:
+            arch = self.read_remote_file("/proc/sys/kernel/arch").decode().strip()
+        except Exception:
+            arch = ""
+        
+        if not arch:
+            result = self.execute_command("uname -m")
+            if not result.success:
+                return None
+            arch = result.stdout.strip()
+        
+        if fingerprint is not None:
+            self._architecture_cache[fingerprint] = arch
+        return arch
     
     def get_device_info(self) -> Dict[str, Any]:
         """Get comprehensive device information."""
         info = {}
         
-        # Architecture
-        arch_result = self.execute_command("uname -m")
-        if arch_result.success:
-            info["architecture"] = arch_result.stdout.strip()
-        
-        # Kernel version
-        kernel_result = self.execute_command("uname -r")
-        if kernel_result.success:
-            info["kernel_version"] = kernel_result.stdout.strip()
-        
-        # Uptime
-        uptime_result = self.execute_command("uptime")
-        if uptime_result.success:
-            info["uptime"] = uptime_result.stdout.strip()
-        
-        # Disk space
-        df_result = self.execute_command("df -h /")
-        if df_result.success:
-            info["disk_space"] = df_result.stdout.strip()
+        # Gather everything in one exec round trip
+        queries = {
+            "architecture": "uname -m",
+            "kernel_version": "uname -r",
+            "uptime": "uptime",
+            "disk_space": "df -h /",
+            "remarkable_version": "cat /etc/version 2>/dev/null || echo 'unknown'",
+        }
+        results = self.execute_script(list(queries.values()))
         
-        # reMarkable version (if available)
-        version_result = self.execute_command("cat /etc/version 2>/dev/null || echo 'unknown'")
-        if version_result.success:
-            info["remarkable_version"] = version_result.stdout.strip()
+        for key, result in zip(queries, results):
+            if result.success:
+                info[key] = result.stdout.strip()
         
         return info
     
@@ -764,8 +1300,9 @@ echo "Robust USB ethernet fix applied successfully"
 echo "You can now connect via USB at 10.11.99.1"
             '''
             
-            # Execute the robust fix script
-            result = self.execute_command(robust_fix_script, timeout=30)
+            # Execute the robust fix script in one exec, streaming its progress;
+            # a step that stalls for 30s without output ends it as a timeout
+            result = self.execute_command(robust_fix_script, timeout=30, real_time_output=True)
             
             if not result.success:
                 self._logger.warning(f"Ethernet fix had issues: {result.stderr}")
@@ -11,9 +11,21 @@ import sys
 from pathlib import Path
 
 
+# Directory name shared by every per-user location of the application
+APP_DIR_NAME = 'remarkable-xovi-installer'
+
+# Resolved once at import; the platform cannot change within a process
+_PLATFORM = 'win' if os.name == 'nt' else 'mac' if sys.platform == 'darwin' else 'linux'
+
+# Base directories, looked up once instead of in every accessor
+_HOME = Path.home() if _PLATFORM != 'win' else None
+_APPDATA = Path(os.getenv('APPDATA', '')) if _PLATFORM == 'win' else None
+_LOCALAPPDATA = Path(os.getenv('LOCALAPPDATA', '')) if _PLATFORM == 'win' else None
+
+
 def is_windows() -> bool:
     """Check if the current operating system is Windows."""
-    return os.name == 'nt'
+    return _PLATFORM == 'win'
 
 
 def get_platform_config_dir(app_name: str) -> Path:
@@ -26,17 +38,18 @@ def get_platform_config_dir(app_name: str) -> Path:
     Returns:
         A Path object pointing to the configuration directory.
     """
-    if is_windows():
+    if _PLATFORM == 'win':
         # Windows: %APPDATA%\app_name
-        config_dir = Path(os.getenv('APPDATA', '')) / app_name
-    elif sys.platform == 'darwin':  # macOS
+        config_dir = _APPDATA / app_name
+    elif _PLATFORM == 'mac':
         # macOS: ~/Library/Application Support/app_name
-        config_dir = Path.home() / 'Library' / 'Application Support' / app_name
+        config_dir = _HOME / 'Library' / 'Application Support' / app_name
     else:  # Linux and other Unix-like
         # Linux: ~/.config/app_name
-        config_dir = Path.home() / '.config' / app_name
+        config_dir = _HOME / '.config' / app_name
     
-    config_dir.mkdir(parents=True, exist_ok=True)
+    if not config_dir.is_dir():
+        config_dir.mkdir(parents=True, exist_ok=True)
     return config_dir
 
 
@@ -50,17 +63,18 @@ def get_platform_cache_dir(app_name: str) -> Path:
     Returns:
         A Path object pointing to the cache directory.
     """
-    if is_windows():
+    if _PLATFORM == 'win':
         # Windows: %LOCALAPPDATA%\app_name\Cache
-        cache_dir = Path(os.getenv('LOCALAPPDATA', '')) / app_name / 'Cache'
-    elif sys.platform == 'darwin':  # macOS
+        cache_dir = _LOCALAPPDATA / app_name / 'Cache'
+    elif _PLATFORM == 'mac':
         # macOS: ~/Library/Caches/app_name
-        cache_dir = Path.home() / 'Library' / 'Caches' / app_name
+        cache_dir = _HOME / 'Library' / 'Caches' / app_name
     else:  # Linux and other Unix-like
         # Linux: ~/.cache/app_name
-        cache_dir = Path.home() / '.cache' / app_name
+        cache_dir = _HOME / '.cache' / app_name
     
-    cache_dir.mkdir(parents=True, exist_ok=True)
+    if not cache_dir.is_dir():
+        cache_dir.mkdir(parents=True, exist_ok=True)
     return cache_dir
 
 
@@ -74,15 +88,16 @@ def get_platform_log_dir(app_name: str) -> Path:
     Returns:
         A Path object pointing to the log directory.
     """
-    if is_windows():
+    if _PLATFORM == 'win':
         # Windows: %LOCALAPPDATA%\app_name\Logs
-        log_dir = Path(os.getenv('LOCALAPPDATA', '')) / app_name / 'Logs'
-    elif sys.platform == 'darwin':  # macOS
+        log_dir = _LOCALAPPDATA / app_name / 'Logs'
+    elif _PLATFORM == 'mac':
         # macOS: ~/Library/Logs/app_name
-        log_dir = Path.home() / 'Library' / 'Logs' / app_name
+        log_dir = _HOME / 'Library' / 'Logs' / app_name
     else:  # Linux and other Unix-like
         # Linux: ~/.local/share/app_name/logs
-        log_dir = Path.home() / '.local' / 'share' / app_name / 'logs'
+        log_dir = _HOME / '.local' / 'share' / app_name / 'logs'
     
-    log_dir.mkdir(parents=True, exist_ok=True)
+    if not log_dir.is_dir():
+        log_dir.mkdir(parents=True, exist_ok=True)
     return log_dir
\ No newline at end of file
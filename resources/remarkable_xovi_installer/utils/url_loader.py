@@ -6,9 +6,57 @@ making them available for dynamic loading throughout the application.
 """
 
 import os
+import re
+import json
+import mmap
 import logging
+import tempfile
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
+
+from .platform_utils import APP_DIR_NAME, get_platform_config_dir
+
+
+# One pass over the weblist: "# ... URLs ..." category comments and http(s) lines
+_WEBLIST_RE = re.compile(rb'^[ \t]*(?:#(?P<cat>[^\n]*URLs[^\n]*?)|(?P<url>http[^\n]*?))[ \t\r]*$', re.MULTILINE)
+_CATEGORY_SUFFIX_RE = re.compile(r' urls| architecture')
+
+# Component markers in release URLs; "xovi-extensions" must precede "xovi"
+_COMPONENT_TOKEN_RE = re.compile(r'xovi-extensions|appload|tripletap|koreader|xovi')
+
+# (marker, excluded markers, component key), first matching rule wins
+_ARCH_RULES = (
+    ("xovi-extensions", (), "xovi_extensions"),
+    ("appload", (), "appload"),
+    ("xovi", ("tripletap",), "xovi_binary"),
+    ("koreader", (), "koreader"),
+)
+
+
+def _classify_arch_urls(urls: List[str]) -> Dict[str, str]:
+    """
+    Map an architecture's download URLs to component keys.
+    
+    Args:
+        urls: URLs listed under one architecture category
+        
+    Returns:
+        Dictionary of component key to URL
+    """
+    components: Dict[str, str] = {}
+    for url in urls:
+        found = set(_COMPONENT_TOKEN_RE.findall(url))
+        for marker, excluded, key in _ARCH_RULES:
+            if marker in found and found.isdisjoint(excluded):
+                components[key] = url
+                break
+    return components
+
+
+def _cache_path() -> Path:
+    """Location of the parsed weblist cache, next to the application config."""
+    return get_platform_config_dir(APP_DIR_NAME) / 'weblist.json'
 
 
 class URLLoader:
@@ -18,6 +66,12 @@ class URLLoader:
     Parses the weblist file and provides structured access to URLs by category.
     """
     
+    __slots__ = (
+        'weblist_path', 'urls', '_logger', '_loaded', '_load_lock',
+        '_arch_urls', '_api_urls', '_additional_urls', '_general_urls',
+        '_lowered', '_pattern_cache',
+    )
+    
     def __init__(self, weblist_path: Optional[Path] = None):
         """
         Initialize URL loader.
@@ -33,8 +87,36 @@ class URLLoader:
         self.urls: Dict[str, List[str]] = {}
         self._logger = logging.getLogger(__name__)
         
-        # Load URLs on initialization
-        self._load_urls()
+        # The weblist is read on first query, not on construction
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        self._arch_urls: Dict[str, Dict[str, str]] = {}
+        self._api_urls: Dict[str, str] = {}
+        self._additional_urls: Dict[str, str] = {}
+        self._general_urls: Dict[str, str] = {}
+        self._lowered: Dict[str, List[Tuple[str, str]]] = {}
+        self._pattern_cache: Dict[Tuple[str, Optional[str]], Optional[str]] = {}
+    
+    def _ensure_loaded(self) -> None:
+        """Load the weblist if no accessor has needed it yet."""
+        if self._loaded:
+            return
+        
+        with self._load_lock:
+            if self._loaded:
+                return
+            
+            self._load_urls()
+            
+            # Component lookups are fixed once the weblist is loaded
+            self._arch_urls = self._build_architecture_urls()
+            self._api_urls = self._build_api_urls()
+            self._additional_urls = self._build_additional_urls()
+            self._general_urls = self._build_general_urls()
+            self._lowered = {cat: [(url, url.lower()) for url in urls] for cat, urls in self.urls.items()}
+            
+            # Published last so lock-free readers never see partial state
+            self._loaded = True
     
     def _load_urls(self) -> None:
         """Load and parse URLs from the weblist file."""
@@ -43,34 +125,88 @@ class URLLoader:
             return
         
         try:
-            with open(self.weblist_path, 'r', encoding='utf-8') as f:
-                current_category = "general"
-                self.urls[current_category] = []
-                
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    
-                    # Skip empty lines and comments
-                    if not line or line.startswith('#'):
-                        # Check if this is a category comment
-                        if line.startswith('#') and 'URLs' in line:
-                            # Extract category name from comment
-                            category = line.replace('#', '').strip().lower()
-                            category = category.replace(' urls', '').replace(' architecture', '').strip()
-                            if category and category not in self.urls:
-                                current_category = category
-                                self.urls[current_category] = []
-                        continue
-                    
-                    # Add URL to current category
-                    if line.startswith('http'):
-                        self.urls[current_category].append(line)
-                
+            st = self.weblist_path.stat()
+            cache_key = [str(self.weblist_path.resolve()), st.st_mtime_ns, st.st_size]
+            
+            cached = self._read_cache(cache_key)
+            if cached is not None:
+                self.urls = cached
+            else:
+                with open(self.weblist_path, 'rb') as f:
+                    if st.st_size:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                            self.urls = self._parse_weblist(data)
+                    else:
+                        self.urls = self._parse_weblist(b'')
+                self._write_cache(cache_key)
+            
             self._logger.info(f"Loaded {sum(len(urls) for urls in self.urls.values())} URLs from {len(self.urls)} categories")
             
         except Exception as e:
             self._logger.error(f"Failed to load URLs from {self.weblist_path}: {e}")
     
+    def _parse_weblist(self, data: Union[bytes, mmap.mmap]) -> Dict[str, List[str]]:
+        """
+        Parse weblist contents.
+        
+        Args:
+            data: Raw weblist contents; only matched fields are decoded
+            
+        Returns:
+            Mapping of category name to its URLs
+        """
+        current_category = "general"
+        urls: Dict[str, List[str]] = {current_category: []}
+        
+        for match in _WEBLIST_RE.finditer(data):
+            url = match.group('url')
+            if url is not None:
+                urls[current_category].append(url.decode('utf-8'))
+                continue
+            
+            # Category comment, e.g. "# ARM32 Architecture URLs" -> "arm32"
+            category = match.group('cat').decode('utf-8').replace('#', '').strip().lower()
+            category = _CATEGORY_SUFFIX_RE.sub('', category).strip()
+            if category and category not in urls:
+                current_category = category
+                urls[current_category] = []
+        
+        return urls
+    
+    def _read_cache(self, cache_key: list) -> Optional[Dict[str, List[str]]]:
+        """
+        Return previously parsed URLs if the weblist is unchanged.
+        
+        Args:
+            cache_key: Weblist path, mtime_ns and size
+            
+        Returns:
+            Cached category mapping, or None on a miss
+        """
+        try:
+            with open(_cache_path(), 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('key') == cache_key:
+                return cached['urls']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        return None
+    
+    def _write_cache(self, cache_key: list) -> None:
+        """Atomically store the parsed URLs for the next process start."""
+        cache_file = _cache_path()
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'key': cache_key, 'urls': self.urls}, f)
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            self._logger.debug(f"Could not write URL cache {cache_file}: {e}")
+    
     def get_urls_by_category(self, category: str) -> List[str]:
         """
         Get all URLs for a specific category.
@@ -81,6 +217,7 @@ class URLLoader:
         Returns:
             List of URLs for the category
         """
+        self._ensure_loaded()
         return self.urls.get(category.lower(), [])
     
     def get_url_by_pattern(self, pattern: str, category: Optional[str] = None) -> Optional[str]:
@@ -94,15 +231,28 @@ class URLLoader:
         Returns:
             First matching URL or None if not found
         """
-        categories_to_search = [category.lower()] if category else self.urls.keys()
+        self._ensure_loaded()
+        pattern = pattern.lower()
+        category = category.lower() if category else None
         
+        # The same handful of component patterns are looked up repeatedly
+        key = (pattern, category)
+        if key in self._pattern_cache:
+            return self._pattern_cache[key]
+        
+        categories_to_search = [category] if category else self._lowered.keys()
+        
+        match = None
         for cat in categories_to_search:
-            if cat in self.urls:
-                for url in self.urls[cat]:
-                    if pattern.lower() in url.lower():
-                        return url
+            for url, lowered in self._lowered.get(cat, ()):
+                if pattern in lowered:
+                    match = url
+                    break
+            if match is not None:
+                break
         
-        return None
+        self._pattern_cache[key] = match
+        return match
     
     def get_architecture_urls(self) -> Dict[str, Dict[str, str]]:
         """
@@ -111,36 +261,8 @@ class URLLoader:
         Returns:
             Dictionary with architecture mappings for components
         """
-        arch_urls = {
-            "arm32": {},
-            "aarch64": {}
-        }
-        
-        # ARM32 URLs
-        arm32_urls = self.get_urls_by_category("arm32")
-        for url in arm32_urls:
-            if "xovi-extensions" in url:
-                arch_urls["arm32"]["xovi_extensions"] = url
-            elif "appload" in url and "xovi-extensions" not in url:
-                arch_urls["arm32"]["appload"] = url
-            elif "xovi" in url and "xovi-extensions" not in url and "tripletap" not in url:
-                arch_urls["arm32"]["xovi_binary"] = url
-            elif "koreader" in url:
-                arch_urls["arm32"]["koreader"] = url
-        
-        # AARCH64 URLs
-        aarch64_urls = self.get_urls_by_category("aarch64")
-        for url in aarch64_urls:
-            if "xovi-extensions" in url:
-                arch_urls["aarch64"]["xovi_extensions"] = url
-            elif "appload" in url and "xovi-extensions" not in url:
-                arch_urls["aarch64"]["appload"] = url
-            elif "xovi" in url and "xovi-extensions" not in url and "tripletap" not in url:
-                arch_urls["aarch64"]["xovi_binary"] = url
-            elif "koreader" in url:
-                arch_urls["aarch64"]["koreader"] = url
-        
-        return arch_urls
+        self._ensure_loaded()
+        return {arch: dict(components) for arch, components in self._arch_urls.items()}
     
     def get_api_urls(self) -> Dict[str, str]:
         """
@@ -149,8 +271,40 @@ class URLLoader:
         Returns:
             Dictionary of API URL templates
         """
+        self._ensure_loaded()
+        return dict(self._api_urls)
+    
+    def get_additional_urls(self) -> Dict[str, str]:
+        """
+        Get additional download URLs.
+        
+        Returns:
+            Dictionary of additional URLs
+        """
+        self._ensure_loaded()
+        return dict(self._additional_urls)
+    
+    def get_general_urls(self) -> Dict[str, str]:
+        """
+        Get general URLs (GitHub repos, documentation, etc.).
+        
+        Returns:
+            Dictionary of general URLs
+        """
+        self._ensure_loaded()
+        return dict(self._general_urls)
+    
+    def _build_architecture_urls(self) -> Dict[str, Dict[str, str]]:
+        """Classify the per-architecture URLs by component."""
+        return {
+            "arm32": _classify_arch_urls(self.urls.get("arm32", [])),
+            "aarch64": _classify_arch_urls(self.urls.get("aarch64", [])),
+        }
+    
+    def _build_api_urls(self) -> Dict[str, str]:
+        """Pick out the GitHub API URL templates."""
         api_urls = {}
-        api_category_urls = self.get_urls_by_category("api")
+        api_category_urls = self.urls.get("api", [])
         
         for url in api_category_urls:
             if "releases/latest" in url:
@@ -160,15 +314,10 @@ class URLLoader:
         
         return api_urls
     
-    def get_additional_urls(self) -> Dict[str, str]:
-        """
-        Get additional download URLs.
-        
-        Returns:
-            Dictionary of additional URLs
-        """
+    def _build_additional_urls(self) -> Dict[str, str]:
+        """Pick out the additional download URLs."""
         additional_urls = {}
-        additional_category_urls = self.get_urls_by_category("additional download")
+        additional_category_urls = self.urls.get("additional download", [])
         
         for url in additional_category_urls:
             if "appload.so" in url:
@@ -180,22 +329,17 @@ class URLLoader:
         
         return additional_urls
     
-    def get_general_urls(self) -> Dict[str, str]:
-        """
-        Get general URLs (GitHub repos, documentation, etc.).
-        
-        Returns:
-            Dictionary of general URLs
-        """
+    def _build_general_urls(self) -> Dict[str, str]:
+        """Pick out the repository and architecture-independent URLs."""
         general_urls = {}
         
         # Get GitHub repository URLs
-        github_urls = self.get_urls_by_category("github repository")
+        github_urls = self.urls.get("github repository", [])
         if github_urls:
             general_urls["freemarkable_repo"] = github_urls[0] if github_urls else ""
         
         # Get tripletap URL from ARM32 category (it's architecture-independent)
-        arm32_urls = self.get_urls_by_category("arm32")
+        arm32_urls = self.urls.get("arm32", [])
         for url in arm32_urls:
             if "tripletap" in url:
                 general_urls["xovi_tripletap"] = url
@@ -206,6 +350,7 @@ class URLLoader:
 
 # Global URL loader instance
 _global_url_loader: Optional[URLLoader] = None
+_url_loader_lock = threading.Lock()
 
 
 def get_url_loader() -> URLLoader:
@@ -217,7 +362,9 @@ def get_url_loader() -> URLLoader:
     """
     global _global_url_loader
     if _global_url_loader is None:
-        _global_url_loader = URLLoader()
+        with _url_loader_lock:
+            if _global_url_loader is None:
+                _global_url_loader = URLLoader()
     return _global_url_loader
 
 
@@ -232,5 +379,6 @@ def init_url_loader(weblist_path: Optional[Path] = None) -> URLLoader:
         Initialized URLLoader instance
     """
     global _global_url_loader
-    _global_url_loader = URLLoader(weblist_path)
-    return _global_url_loader
\ No newline at end of file
+    with _url_loader_lock:
+        _global_url_loader = URLLoader(weblist_path)
+        return _global_url_loader
\ No newline at end of file
@@ -7,12 +7,19 @@ file paths, network connectivity, and other user inputs.
 
 import re
 import os
+import errno
+import stat
+import importlib.util
 import socket
+import time
 import subprocess
 import logging
+from shutil import which
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Union, Optional, List, Tuple, Dict, Any
-from ipaddress import IPv4Address, AddressValueError
+from types import MappingProxyType
+from typing import Union, Optional, List, Tuple, Dict, Any, Mapping
+from ipaddress import IPv4Address, AddressValueError, ip_network
 from urllib.parse import urlparse
 
 # Import Windows compatibility utilities
@@ -27,6 +34,84 @@ except ImportError:
     def get_windows_ssh_client_path():
         return None
 
+# The platform cannot change while the process runs
+_IS_WINDOWS = is_windows()
+
+_EMPTY_DETAILS: Mapping[str, Any] = MappingProxyType({})
+
+
+# Checked once without importing paramiko itself
+_PARAMIKO_AVAILABLE = importlib.util.find_spec('paramiko') is not None
+
+# How long a successful hostname lookup is reused, in seconds
+_DNS_CACHE_TTL = 30.0
+
+# stat() errors that Path.exists() reports as "does not exist"
+_MISSING_PATH_ERRNOS = frozenset({errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP})
+
+# Regex patterns matching the bash script
+_IP_RE = re.compile(r'^[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}$')
+
+# Characters that are unsafe in filenames: <>:"/\|?* and ASCII controls
+_FILENAME_BAD_CHARS = [ord(c) for c in '<>:"/\\|?*'] + list(range(0x20))
+
+# str.translate tables per replacement string; '_' is prebuilt
+_FILENAME_TRANSLATE: Dict[str, Dict[int, str]] = {'_': dict.fromkeys(_FILENAME_BAD_CHARS, '_')}
+
+_BACKUP_NAME_RE = re.compile(r'^[a-zA-Z0-9._-]+$')
+
+_DEFAULT_URL_SCHEMES = frozenset({'http', 'https'})
+
+# Windows device names that cannot be used as backup names
+_RESERVED_BACKUP_NAMES = frozenset(
+    ['con', 'prn', 'aux', 'nul'] + [f'com{i}' for i in range(1, 10)] + [f'lpt{i}' for i in range(1, 10)]
+)
+
+# Installation stages in display order, plus a set for membership tests
+_VALID_STAGES = ('not_started', '1', '2', 'completed', 'failed', 'launcher_only')
+_VALID_STAGE_SET = frozenset(_VALID_STAGES)
+
+# Accepted device type spellings and their canonical form
+_DEVICE_TYPE_CANON = {
+    'rM1': 'rM1', 'rM2': 'rM2', 'rMPP': 'rMPP',
+    'rm1': 'rM1', 'rm2': 'rM2', 'rmpp': 'rMPP',
+}
+_SUPPORTED_DEVICE_TYPES = frozenset({'rM1', 'rM2'})
+
+# Characters that break password entry over SSH
+_BAD_PASSWORD_CHARS_RE = re.compile(r'[\n\r\x00]')
+
+# Common reMarkable IP ranges as (network, netmask) integers
+_REMARKABLE_NETWORKS = tuple((int(n.network_address), int(n.netmask)) for n in map(ip_network, (
+    "10.11.99.0/24",    # USB ethernet default
+    "192.168.0.0/16",   # Common WiFi networks
+    "172.16.0.0/12",    # Private networks
+    "10.0.0.0/8"        # Private networks
+)))
+
+# 127.0.0.0/8 and 224.0.0.0/4, the IPv4 loopback and multicast blocks
+_LOOPBACK_MASK, _LOOPBACK_NET = 0xFF000000, 0x7F000000
+_MULTICAST_MASK, _MULTICAST_NET = 0xF0000000, 0xE0000000
+
+
+def _is_valid_hostname(hostname: str) -> bool:
+    """
+    Check hostname syntax label by label in linear time.
+    
+    Each dot-separated label must be 1-63 ASCII letters, digits or hyphens,
+    and must start and end with a letter or digit.
+    """
+    if not hostname.isascii():
+        return False
+    for label in hostname.split('.'):
+        if not 0 < len(label) <= 63:
+            return False
+        if not (label[0].isalnum() and label[-1].isalnum()):
+            return False
+        if not label.replace('-', 'a').isalnum():
+            return False
+    return True
+
 
 class ValidationError(Exception):
     """Custom exception for validation errors."""
@@ -36,10 +121,13 @@ class ValidationError(Exception):
 class ValidationResult:
     """Result of a validation operation."""
     
+    __slots__ = ('is_valid', 'message', 'details')
+    
     def __init__(self, is_valid: bool, message: str = "", details: Optional[Dict[str, Any]] = None):
         self.is_valid = is_valid
         self.message = message
-        self.details = details or {}
+        # Results without details share one read-only empty mapping
+        self.details = details if details is not None else _EMPTY_DETAILS
     
     def __bool__(self) -> bool:
         return self.is_valid
@@ -59,17 +147,11 @@ class Validator:
     def __init__(self):
         self._logger = logging.getLogger(__name__)
         
-        # Regex patterns matching the bash script
-        self.ip_pattern = re.compile(r'^[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}$')
-        self.hostname_pattern = re.compile(r'^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*$')
-        
-        # Common reMarkable IP ranges
-        self.remarkable_networks = [
-            "10.11.99.0/24",    # USB ethernet default
-            "192.168.0.0/16",   # Common WiFi networks
-            "172.16.0.0/12",    # Private networks
-            "10.0.0.0/8"        # Private networks
-        ]
+        # SSH tooling does not change while the process runs
+        self._ssh_req_cache: Optional[ValidationResult] = None
+        
+        # hostname -> (resolved at, IPv4 address)
+        self._dns_cache: Dict[str, Tuple[float, str]] = {}
     
     def validate_ip_address(self, ip_address: str, allow_hostnames: bool = False) -> ValidationResult:
         """
@@ -87,40 +169,42 @@ class Validator:
         
         ip_address = ip_address.strip()
         
-        # Check basic format with regex (matching bash script)
-        if self.ip_pattern.match(ip_address):
-            try:
-                # Validate with ipaddress module for proper validation
-                ip_obj = IPv4Address(ip_address)
-                
-                # Additional checks for reMarkable devices
-                is_remarkable_range = self._is_remarkable_ip_range(ip_address)
-                is_private = ip_obj.is_private
-                
-                details = {
-                    "ip_object": ip_obj,
-                    "is_private": is_private,
-                    "is_remarkable_range": is_remarkable_range,
-                    "ip_type": "ipv4"
-                }
-                
-                if ip_obj.is_loopback:
-                    return ValidationResult(False, "Loopback addresses are not valid for reMarkable devices", details)
-                
-                if ip_obj.is_multicast:
-                    return ValidationResult(False, "Multicast addresses are not valid for reMarkable devices", details)
-                
-                return ValidationResult(True, "Valid IP address", details)
-                
-            except AddressValueError as e:
+        # IPv4Address is the single parser; the bash-style regex only picks
+        # the error message for dotted-quad strings it rejects
+        try:
+            ip_obj = IPv4Address(ip_address)
+        except (AddressValueError, ValueError) as e:
+            ip_obj = None
+            if _IP_RE.match(ip_address):
                 return ValidationResult(False, f"Invalid IP address format: {e}")
         
+        if ip_obj is not None:
+            # Additional checks for reMarkable devices
+            ip_int = int(ip_obj)
+            is_remarkable_range = self._is_remarkable_ip_range(ip_int)
+            is_private = ip_obj.is_private
+            
+            details = {
+                "ip_object": ip_obj,
+                "is_private": is_private,
+                "is_remarkable_range": is_remarkable_range,
+                "ip_type": "ipv4"
+            }
+            
+            if ip_int & _LOOPBACK_MASK == _LOOPBACK_NET:
+                return ValidationResult(False, "Loopback addresses are not valid for reMarkable devices", details)
+            
+            if ip_int & _MULTICAST_MASK == _MULTICAST_NET:
+                return ValidationResult(False, "Multicast addresses are not valid for reMarkable devices", details)
+            
+            return ValidationResult(True, "Valid IP address", details)
+        
         # If not a valid IP, check if it's a hostname (if allowed)
         if allow_hostnames:
-            if self.hostname_pattern.match(ip_address):
+            if _is_valid_hostname(ip_address):
                 try:
                     # Try to resolve hostname
-                    resolved_ip = socket.gethostbyname(ip_address)
+                    resolved_ip = self._resolve_hostname(ip_address)
                     recursive_result = self.validate_ip_address(resolved_ip, allow_hostnames=False)
                     
                     if recursive_result.is_valid:
@@ -141,19 +225,34 @@ class Validator:
         
         return ValidationResult(False, "Invalid IP address format. Expected format: xxx.xxx.xxx.xxx")
     
-    def _is_remarkable_ip_range(self, ip_address: str) -> bool:
-        """Check if IP address is in a typical reMarkable device range."""
-        try:
-            ip = IPv4Address(ip_address)
-            from ipaddress import ip_network
+    def _resolve_hostname(self, hostname: str) -> str:
+        """
+        Resolve a hostname to an IPv4 address, reusing recent answers.
+        
+        Args:
+            hostname: Hostname to resolve
             
-            for network_str in self.remarkable_networks:
-                network = ip_network(network_str)
-                if ip in network:
-                    return True
-            return False
-        except (AddressValueError, ValueError):
-            return False
+        Returns:
+            Resolved IPv4 address
+            
+        Raises:
+            socket.gaierror: If the hostname cannot be resolved
+        """
+        now = time.monotonic()
+        cached = self._dns_cache.get(hostname)
+        if cached is not None and now - cached[0] < _DNS_CACHE_TTL:
+            return cached[1]
+        
+        resolved_ip = socket.gethostbyname(hostname)
+        self._dns_cache[hostname] = (now, resolved_ip)
+        return resolved_ip
+    
+    def _is_remarkable_ip_range(self, ip_int: int) -> bool:
+        """Check if an IPv4 address, as an integer, is in a typical reMarkable device range."""
+        for network, netmask in _REMARKABLE_NETWORKS:
+            if ip_int & netmask == network:
+                return True
+        return False
     
     def validate_ssh_password(self, password: str, min_length: int = 1, max_length: int = 256) -> ValidationResult:
         """
@@ -180,18 +279,32 @@ class Validator:
             return ValidationResult(False, f"Password too long (maximum {max_length} characters)")
         
         # Check for problematic characters that might cause SSH issues
-        problematic_chars = ['\n', '\r', '\0']
-        for char in problematic_chars:
-            if char in password:
-                return ValidationResult(False, f"Password contains invalid character: {repr(char)}")
+        bad_char = _BAD_PASSWORD_CHARS_RE.search(password)
+        if bad_char:
+            return ValidationResult(False, f"Password contains invalid character: {repr(bad_char.group())}")
+        
+        # Basic strength indicators, gathered in a single pass
+        has_uppercase = has_lowercase = has_digits = has_special = False
+        for c in password:
+            if c.isupper():
+                has_uppercase = True
+            elif c.islower():
+                has_lowercase = True
+            elif c.isdigit():
+                has_digits = True
+            # Independent of the case checks: cased symbols such as 'Ⓐ' are
+            # not alphanumeric and count as special too
+            if not c.isalnum():
+                has_special = True
+            if has_uppercase and has_lowercase and has_digits and has_special:
+                break
         
-        # Basic strength indicators
         details = {
             "length": len(password),
-            "has_uppercase": any(c.isupper() for c in password),
-            "has_lowercase": any(c.islower() for c in password),
-            "has_digits": any(c.isdigit() for c in password),
-            "has_special": any(not c.isalnum() for c in password)
+            "has_uppercase": has_uppercase,
+            "has_lowercase": has_lowercase,
+            "has_digits": has_digits,
+            "has_special": has_special
         }
         
         return ValidationResult(True, "Valid password", details)
@@ -227,8 +340,21 @@ class Validator:
                 # Allow relative paths but warn about potential security issues with ..
                 self._logger.warning(f"Path contains '..' which may be a security risk: {file_path}")
             
-            # Check existence
-            exists = path_obj.exists()
+            # Check existence; one lstat (plus a stat for symlinks) covers all
+            # the type and size details below
+            st = None
+            is_symlink = False
+            try:
+                st = os.lstat(path_obj)
+                is_symlink = stat.S_ISLNK(st.st_mode)
+                if is_symlink:
+                    st = os.stat(path_obj)
+            except OSError as e:
+                if e.errno not in _MISSING_PATH_ERRNOS:
+                    raise
+                st = None  # Missing, a dangling symlink or a symlink loop
+            
+            exists = st is not None
             if must_exist and not exists:
                 return ValidationResult(False, f"Path does not exist: {file_path}")
             
@@ -240,14 +366,14 @@ class Validator:
             }
             
             if exists:
-                is_file = path_obj.is_file()
-                is_dir = path_obj.is_dir()
+                is_file = stat.S_ISREG(st.st_mode)
+                is_dir = stat.S_ISDIR(st.st_mode)
                 
                 details.update({
                     "is_file": is_file,
                     "is_dir": is_dir,
-                    "is_symlink": path_obj.is_symlink(),
-                    "size_bytes": path_obj.stat().st_size if is_file else None
+                    "is_symlink": is_symlink,
+                    "size_bytes": st.st_size if is_file else None
                 })
                 
                 # Type checks
@@ -257,17 +383,19 @@ class Validator:
                 if must_be_dir and not is_dir:
                     return ValidationResult(False, f"Path is not a directory: {file_path}")
                 
-                # Permission checks
-                if must_be_readable and not os.access(path_obj, os.R_OK):
+                # Permission checks, one access() probe per mode
+                readable = os.access(path_obj, os.R_OK)
+                writable = os.access(path_obj, os.W_OK)
+                
+                if must_be_readable and not readable:
                     return ValidationResult(False, f"Path is not readable: {file_path}")
                 
-                if must_be_writable and not os.access(path_obj, os.W_OK):
+                if must_be_writable and not writable:
                     return ValidationResult(False, f"Path is not writable: {file_path}")
                 
                 details.update({
-                    "readable": os.access(path_obj, os.R_OK),
-                    "writable": os.access(path_obj, os.W_OK),
-                    "executable": os.access(path_obj, os.X_OK)
+                    "readable": readable,
+                    "writable": writable
                 })
             
             return ValidationResult(True, "Valid file path", details)
@@ -290,7 +418,9 @@ class Validator:
             return ValidationResult(False, "URL cannot be empty")
         
         if allowed_schemes is None:
-            allowed_schemes = ['http', 'https']
+            allowed = _DEFAULT_URL_SCHEMES
+        else:
+            allowed = frozenset(scheme.lower() for scheme in allowed_schemes)
         
         try:
             parsed = urlparse(url)
@@ -298,8 +428,8 @@ class Validator:
             if not parsed.scheme:
                 return ValidationResult(False, "URL missing scheme (http/https)")
             
-            if parsed.scheme.lower() not in allowed_schemes:
-                return ValidationResult(False, f"Invalid URL scheme. Allowed: {allowed_schemes}")
+            if parsed.scheme.lower() not in allowed:
+                return ValidationResult(False, f"Invalid URL scheme. Allowed: {sorted(allowed)}")
             
             if not parsed.netloc:
                 return ValidationResult(False, "URL missing network location (domain)")
@@ -331,23 +461,14 @@ class Validator:
         if not device_type:
             return ValidationResult(False, "Device type cannot be empty")
         
-        valid_types = ['rM1', 'rM2', 'rMPP', 'rm1', 'rm2', 'rmpp']
-        normalized = device_type.strip()
-        
-        if normalized not in valid_types:
-            return ValidationResult(False, f"Invalid device type. Must be one of: {valid_types}")
-        
-        # Normalize to standard format
-        normalized_upper = normalized.upper()
-        if normalized_upper in ['RM1', 'RM2', 'RMPP']:
-            canonical = 'r' + normalized_upper[1:]  # Convert RM1 -> rM1
-        else:
-            canonical = normalized
+        canonical = _DEVICE_TYPE_CANON.get(device_type.strip())
+        if canonical is None:
+            return ValidationResult(False, f"Invalid device type. Must be one of: {list(_DEVICE_TYPE_CANON)}")
         
         details = {
             "original": device_type,
             "normalized": canonical,
-            "is_supported": canonical in ['rM1', 'rM2']  # rMPP is future support
+            "is_supported": canonical in _SUPPORTED_DEVICE_TYPES  # rMPP is future support
         }
         
         return ValidationResult(True, "Valid device type", details)
@@ -371,12 +492,10 @@ class Validator:
                 return ValidationResult(False, f"Invalid host: {ip_result.message}")
             
             # Attempt socket connection
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
-            
             try:
-                result = sock.connect_ex((host, port))
-                sock.close()
+                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                    sock.settimeout(timeout)
+                    result = sock.connect_ex((host, port))
                 
                 if result == 0:
                     details = {
@@ -404,14 +523,47 @@ class Validator:
         except Exception as e:
             return ValidationResult(False, f"Network connectivity check failed: {e}")
     
+    def check_network_connectivity_many(self, targets: List[Tuple[str, int]],
+                                        timeout: int = 5) -> Dict[Tuple[str, int], ValidationResult]:
+        """
+        Check connectivity to several hosts concurrently.
+        
+        The handshakes overlap, so probing e.g. the USB address and WiFi
+        candidates takes about as long as the slowest single probe.
+        
+        Args:
+            targets: (host, port) pairs to probe
+            timeout: Connection timeout in seconds for each probe
+            
+        Returns:
+            Dictionary mapping each (host, port) pair to its ValidationResult
+        """
+        if not targets:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(len(targets), 16)) as executor:
+            futures = {
+                target: executor.submit(self.check_network_connectivity, target[0], target[1], timeout)
+                for target in targets
+            }
+            return {target: future.result() for target, future in futures.items()}
+    
     def check_ssh_requirements(self) -> ValidationResult:
         """
         Check if SSH client requirements are met.
         
+        The probe runs once per validator; later calls return the same result.
+        
         Returns:
             ValidationResult with SSH requirements status
         """
-        if is_windows():
+        if self._ssh_req_cache is None:
+            self._ssh_req_cache = self._check_ssh_requirements_uncached()
+        return self._ssh_req_cache
+    
+    def _check_ssh_requirements_uncached(self) -> ValidationResult:
+        """Probe the platform for a usable SSH client."""
+        if _IS_WINDOWS:
             # Use Windows-specific SSH checking
             ssh_support = check_windows_ssh_support()
             
@@ -452,23 +604,15 @@ class Validator:
             available_commands = {}
             
             for cmd in required_commands:
-                try:
-                    # Check if command exists
-                    result = subprocess.run(['which', cmd], capture_output=True, text=True, timeout=5)
-                    if result.returncode == 0:
-                        available_commands[cmd] = result.stdout.strip()
-                    else:
-                        missing_commands.append(cmd)
-                except (subprocess.TimeoutExpired, FileNotFoundError):
+                # Check if command exists
+                path = which(cmd)
+                if path:
+                    available_commands[cmd] = path
+                else:
                     missing_commands.append(cmd)
             
             # Check for paramiko as primary SSH client
-            paramiko_available = False
-            try:
-                import paramiko
-                paramiko_available = True
-            except ImportError:
-                pass
+            paramiko_available = _PARAMIKO_AVAILABLE
             
             if paramiko_available:
                 available_commands['paramiko'] = 'python module'
@@ -517,8 +661,10 @@ class Validator:
             return "unnamed"
         
         # Remove problematic characters
-        problematic_chars = r'[<>:"/\\|?*\x00-\x1f]'
-        sanitized = re.sub(problematic_chars, replacement, filename)
+        table = _FILENAME_TRANSLATE.get(replacement)
+        if table is None:
+            table = _FILENAME_TRANSLATE[replacement] = dict.fromkeys(_FILENAME_BAD_CHARS, replacement)
+        sanitized = filename.translate(table)
         
         # Remove leading/trailing dots and spaces
         sanitized = sanitized.strip('. ')
@@ -547,7 +693,7 @@ class Validator:
             return ValidationResult(False, "Backup name cannot be empty")
         
         # Check for valid characters (alphanumeric, underscore, hyphen, dot)
-        if not re.match(r'^[a-zA-Z0-9._-]+$', backup_name):
+        if not _BACKUP_NAME_RE.match(backup_name):
             return ValidationResult(False, "Backup name contains invalid characters")
         
         # Check length
@@ -555,8 +701,7 @@ class Validator:
             return ValidationResult(False, "Backup name too long (max 100 characters)")
         
         # Check for reserved names
-        reserved_names = ['con', 'prn', 'aux', 'nul'] + [f'com{i}' for i in range(1, 10)] + [f'lpt{i}' for i in range(1, 10)]
-        if backup_name.lower() in reserved_names:
+        if backup_name.lower() in _RESERVED_BACKUP_NAMES:
             return ValidationResult(False, f"Backup name '{backup_name}' is reserved")
         
         details = {
@@ -577,22 +722,21 @@ class Validator:
         Returns:
             ValidationResult with stage validation
         """
-        valid_stages = ['not_started', '1', '2', 'completed', 'failed', 'launcher_only']
-        
-        if stage not in valid_stages:
-            return ValidationResult(False, f"Invalid stage. Must be one of: {valid_stages}")
+        if stage not in _VALID_STAGE_SET:
+            return ValidationResult(False, f"Invalid stage. Must be one of: {list(_VALID_STAGES)}")
         
         details = {
             "stage": stage,
             "is_numeric": stage.isdigit(),
-            "valid_stages": valid_stages
+            "valid_stages": list(_VALID_STAGES)
         }
         
         return ValidationResult(True, "Valid installation stage", details)
 
 
-# Global validator instance
-_global_validator: Optional[Validator] = None
+# Global validator instance; construction is cheap, so it is created eagerly
+# at import and needs no locking
+_global_validator = Validator()
 
 
 def get_validator() -> Validator:
@@ -602,9 +746,6 @@ def get_validator() -> Validator:
     Returns:
         Global Validator instance
     """
-    global _global_validator
-    if _global_validator is None:
-        _global_validator = Validator()
     return _global_validator
 
 
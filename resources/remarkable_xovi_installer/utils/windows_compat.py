@@ -6,43 +6,91 @@ for operations that may differ between Windows and Unix-like systems.
 """
 
 import os
+import re
 import sys
+import importlib.util
+import shutil
+import select
 import subprocess
+import time
 import logging
+from functools import lru_cache, wraps
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import platform
 
-# Windows-specific imports
-if os.name == 'nt':
-    try:
-        import winreg
-        import ctypes
-        from ctypes import wintypes
-        import win32api
-        import win32con
-        import win32security
-        WINDOWS_MODULES_AVAILABLE = True
-    except ImportError:
-        WINDOWS_MODULES_AVAILABLE = False
-        winreg = None
-        ctypes = None
-        win32api = None
+# Platform facts that cannot change while the process runs
+_IS_WINDOWS = os.name == 'nt'
+_EXE_EXT = '.exe' if _IS_WINDOWS else ''
+
+# Windows-specific imports; pywin32 modules are imported only inside the
+# functions that use them, and its presence is checked without loading it
+if _IS_WINDOWS:
+    import ctypes
+    WINDOWS_MODULES_AVAILABLE = importlib.util.find_spec('win32api') is not None
 else:
     WINDOWS_MODULES_AVAILABLE = False
-    winreg = None
     ctypes = None
-    win32api = None
+
+
+# Well-known OpenSSH client install locations on Windows
+_OPENSSH_CLIENT_PATHS = (
+    r"C:\Windows\System32\OpenSSH\ssh.exe",
+    r"C:\Program Files\OpenSSH\ssh.exe",
+    r"C:\Program Files (x86)\OpenSSH\ssh.exe",
+)
+
+# Service names registered by the Windows OpenSSH feature
+_SSH_SERVICE_NAMES = ("sshd", "ssh-agent")
+
+# Connect budget for the loopback SSH port probe, in seconds
+_FIREWALL_PROBE_TIMEOUT = 0.1
+
+# How long probe results (subprocesses, imports, socket checks) are reused
+_PROBE_CACHE_TTL = 60.0
+_probe_cache: Dict[Any, Tuple[float, Any]] = {}
+
+
+def _ttl_cache(seconds: float):
+    """
+    Memoize a function's results per argument set for a number of seconds.
+    
+    The wrapped function gains an invalidate() method that drops its
+    cached results.
+    """
+    def decorator(func):
+        name = func.__qualname__
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            cached = _probe_cache.get(key)
+            if cached is not None and now - cached[0] < seconds:
+                return cached[1]
+            value = func(*args, **kwargs)
+            _probe_cache[key] = (now, value)
+            return value
+        
+        def invalidate() -> None:
+            for key in [k for k in _probe_cache if k[0] == name]:
+                _probe_cache.pop(key, None)
+        
+        wrapper.invalidate = invalidate
+        return wrapper
+    return decorator
 
 
 def is_windows() -> bool:
     """Check if running on Windows."""
-    return os.name == 'nt'
+    return _IS_WINDOWS
 
 
+@lru_cache(maxsize=1)
 def is_admin() -> bool:
     """Check if running with administrator privileges on Windows."""
-    if not is_windows():
+    if not _IS_WINDOWS:
         return os.geteuid() == 0 if hasattr(os, 'geteuid') else False
     
     if not WINDOWS_MODULES_AVAILABLE:
@@ -54,9 +102,10 @@ def is_admin() -> bool:
         return False
 
 
+@lru_cache(maxsize=1)
 def get_windows_version() -> Optional[str]:
     """Get Windows version information."""
-    if not is_windows():
+    if not _IS_WINDOWS:
         return None
     
     try:
@@ -65,75 +114,112 @@ def get_windows_version() -> Optional[str]:
         return "Unknown Windows Version"
 
 
-def check_windows_ssh_support() -> Dict[str, Any]:
-    """Check Windows SSH support capabilities."""
-    result = {
-        "openssh_available": False,
-        "putty_available": False,
-        "paramiko_available": False,
-        "windows_ssh_service": False,
-        "recommended_client": "paramiko"
-    }
-    
-    if not is_windows():
-        return result
-    
-    # Check for paramiko (our primary SSH client)
+def _probe_paramiko() -> Dict[str, Any]:
+    """Check for paramiko (our primary SSH client)."""
     try:
         import paramiko
-        result["paramiko_available"] = True
-        result["recommended_client"] = "paramiko"
+        return {"paramiko_available": True, "recommended_client": "paramiko"}
     except ImportError:
-        pass
-    
-    # Check for OpenSSH (Windows 10/11 includes this)
+        return {}
+
+
+def _probe_openssh() -> Dict[str, Any]:
+    """Check for OpenSSH (Windows 10/11 includes this)."""
     try:
         ssh_result = subprocess.run(
             ["ssh", "-V"], 
             capture_output=True, 
-            text=True, 
             timeout=5
         )
-        if ssh_result.returncode == 0 or "OpenSSH" in ssh_result.stderr:
-            result["openssh_available"] = True
+        if ssh_result.returncode == 0 or b"OpenSSH" in ssh_result.stderr:
+            return {"openssh_available": True}
     except (subprocess.SubprocessError, FileNotFoundError, subprocess.TimeoutExpired):
         pass
-    
-    # Check for PuTTY
+    return {}
+
+
+def _probe_putty() -> Dict[str, Any]:
+    """Check for PuTTY."""
     try:
         putty_result = subprocess.run(
             ["putty", "-V"], 
             capture_output=True, 
-            text=True, 
             timeout=5
         )
         if putty_result.returncode == 0:
-            result["putty_available"] = True
+            return {"putty_available": True}
     except (subprocess.SubprocessError, FileNotFoundError, subprocess.TimeoutExpired):
         pass
+    return {}
+
+
+def _probe_ssh_service() -> Dict[str, Any]:
+    """Check Windows SSH service."""
+    try:
+        import win32service
+        scm = win32service.OpenSCManager(None, None, win32service.SC_MANAGER_CONNECT)
+    except Exception:
+        return {}
+    
+    try:
+        # Open the known OpenSSH services by name rather than enumerating all
+        for name in _SSH_SERVICE_NAMES:
+            try:
+                handle = win32service.OpenService(scm, name, win32service.SERVICE_QUERY_STATUS)
+            except Exception:
+                continue
+            win32service.CloseServiceHandle(handle)
+            return {"windows_ssh_service": True}
+    finally:
+        win32service.CloseServiceHandle(scm)
+    return {}
+
+
+@_ttl_cache(_PROBE_CACHE_TTL)
+def check_windows_ssh_support(full: bool = False) -> Dict[str, Any]:
+    """
+    Check Windows SSH support capabilities.
+    
+    Args:
+        full: Also probe OpenSSH, PuTTY and the SSH service when paramiko is
+            available. By default those probes only run as a fallback, so
+            their fields stay False whenever paramiko is usable.
     
-    # Check Windows SSH service
+    Returns:
+        Dictionary of SSH client availability flags
+    """
+    result = {
+        "openssh_available": False,
+        "putty_available": False,
+        "paramiko_available": False,
+        "windows_ssh_service": False,
+        "recommended_client": "paramiko"
+    }
+    
+    if not _IS_WINDOWS:
+        return result
+    
+    # paramiko is the client we actually use; the rest only matters without it
+    result.update(_probe_paramiko())
+    if result["paramiko_available"] and not full:
+        return result
+    
+    probes = [_probe_openssh, _probe_putty]
     if WINDOWS_MODULES_AVAILABLE:
-        try:
-            import win32service
-            services = win32service.EnumServicesStatus(
-                win32service.OpenSCManager(None, None, win32service.SC_MANAGER_ENUMERATE_SERVICE),
-                win32service.SERVICE_TYPE_WIN32,
-                win32service.SERVICE_STATE_ALL
-            )
-            for service in services:
-                if 'ssh' in service[0].lower():
-                    result["windows_ssh_service"] = True
-                    break
-        except Exception:
-            pass
+        probes.append(_probe_ssh_service)
+    
+    # The probes are independent and mostly wait on child processes, so run
+    # them side by side; each subprocess keeps its own timeout
+    with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+        for future in as_completed([executor.submit(probe) for probe in probes]):
+            result.update(future.result())
     
     return result
 
 
 def get_windows_temp_directory() -> Path:
     """Get Windows-appropriate temporary directory."""
-    if is_windows():
+    if _IS_WINDOWS:
         # Use Windows temp directory
         temp_dir = Path(os.environ.get('TEMP', os.environ.get('TMP', r'C:\Temp')))
     else:
@@ -143,9 +229,10 @@ def get_windows_temp_directory() -> Path:
     return temp_dir
 
 
+@lru_cache(maxsize=1)
 def get_windows_downloads_directory() -> Path:
     """Get Windows-appropriate downloads directory."""
-    if is_windows():
+    if _IS_WINDOWS:
         # Try to get user's Downloads folder
         try:
             import winreg
@@ -178,21 +265,26 @@ def normalize_path_for_platform(path_str: str) -> str:
 
 def get_executable_extension() -> str:
     """Get executable file extension for the current platform."""
-    return '.exe' if is_windows() else ''
+    return _EXE_EXT
 
 
+@_ttl_cache(_PROBE_CACHE_TTL)
 def check_windows_firewall_ssh() -> bool:
     """Check if SSH port is blocked by Windows Firewall."""
-    if not is_windows() or not WINDOWS_MODULES_AVAILABLE:
+    if not _IS_WINDOWS or not WINDOWS_MODULES_AVAILABLE:
         return True  # Assume OK on non-Windows
     
     try:
-        # Simple check - try to create a socket on SSH port
+        # Simple check - try to create a socket on SSH port. The connect is
+        # non-blocking with a short budget: loopback answers at once, so a
+        # silent port is treated as closed instead of waiting a full second
         import socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(1)
-        result = sock.connect_ex(('127.0.0.1', 22))
-        sock.close()
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.setblocking(False)
+            sock.connect_ex(('127.0.0.1', 22))
+            # Windows reports a failed non-blocking connect via exceptfds
+            _, writable, _ = select.select([], [sock], [sock], _FIREWALL_PROBE_TIMEOUT)
+            result = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) if writable else -1
         
         # If we can connect to localhost:22, firewall likely allows SSH
         return result == 0
@@ -200,13 +292,125 @@ def check_windows_firewall_ssh() -> bool:
         return True  # Assume OK if we can't check
 
 
+# 'ipconfig /all' lines of interest, in priority order: adapter headers,
+# IPv4 addresses (text after the last colon), then ethernet/wireless hints
+_IPCONFIG_LINE_RE = re.compile(
+    r'^(?:(?P<hdr>(?=[^\n]*:)[^\n]*(?i:adapter)[^\n]*)'
+    r'|(?=[^\n]*IPv4 Address)(?:[^\n]*:)?(?P<ip>[^\n:]*)'
+    r'|(?P<eth>[^\n]*(?i:ethernet)[^\n]*)'
+    r'|(?P<wifi>[^\n]*(?i:wireless|wi-fi)[^\n]*))$',
+    re.MULTILINE
+)
+
+# IP Helper API constants (iptypes.h / ipifcons.h)
+_AF_INET = 2
+_GAA_FLAGS = 0x2 | 0x4 | 0x8  # Skip anycast, multicast and DNS server lists
+_ERROR_BUFFER_OVERFLOW = 111
+_IF_TYPES = {6: 'ethernet', 71: 'wifi'}  # IF_TYPE_ETHERNET_CSMACD, IF_TYPE_IEEE80211
+_IF_TYPE_SOFTWARE_LOOPBACK = 24  # Not listed by ipconfig
+
+
+def _get_adapters_via_iphlpapi() -> List[Dict[str, str]]:
+    """
+    Read IPv4 adapters in-process with GetAdaptersAddresses.
+    
+    Adapters are named by their friendly name (e.g. "Ethernet") rather than
+    the ipconfig header line ("Ethernet adapter Ethernet:"), and the
+    software loopback interface is skipped.
+    
+    Only the leading fields of the IP Helper structures are declared; the
+    records are read in place from the buffer the API fills, so the
+    truncated layouts are safe.
+    """
+    import ctypes
+    from ctypes import wintypes
+    
+    class SOCKET_ADDRESS(ctypes.Structure):
+        _fields_ = [("lpSockaddr", ctypes.c_void_p), ("iSockaddrLength", ctypes.c_int)]
+    
+    class IP_ADAPTER_UNICAST_ADDRESS(ctypes.Structure):
+        pass
+    
+    IP_ADAPTER_UNICAST_ADDRESS._fields_ = [
+        ("Length", wintypes.ULONG),
+        ("Flags", wintypes.DWORD),
+        ("Next", ctypes.POINTER(IP_ADAPTER_UNICAST_ADDRESS)),
+        ("Address", SOCKET_ADDRESS),
+    ]
+    
+    class IP_ADAPTER_ADDRESSES(ctypes.Structure):
+        pass
+    
+    IP_ADAPTER_ADDRESSES._fields_ = [
+        ("Length", wintypes.ULONG),
+        ("IfIndex", wintypes.DWORD),
+        ("Next", ctypes.POINTER(IP_ADAPTER_ADDRESSES)),
+        ("AdapterName", ctypes.c_char_p),
+        ("FirstUnicastAddress", ctypes.POINTER(IP_ADAPTER_UNICAST_ADDRESS)),
+        ("FirstAnycastAddress", ctypes.c_void_p),
+        ("FirstMulticastAddress", ctypes.c_void_p),
+        ("FirstDnsServerAddress", ctypes.c_void_p),
+        ("DnsSuffix", ctypes.c_wchar_p),
+        ("Description", ctypes.c_wchar_p),
+        ("FriendlyName", ctypes.c_wchar_p),
+        ("PhysicalAddress", ctypes.c_ubyte * 8),
+        ("PhysicalAddressLength", wintypes.ULONG),
+        ("Flags", wintypes.ULONG),
+        ("Mtu", wintypes.ULONG),
+        ("IfType", wintypes.ULONG),
+    ]
+    
+    get_adapters = ctypes.windll.iphlpapi.GetAdaptersAddresses
+    size = wintypes.ULONG(16 * 1024)
+    for _ in range(3):  # The adapter list can grow between calls
+        buf = ctypes.create_string_buffer(size.value)
+        ret = get_adapters(_AF_INET, _GAA_FLAGS, None, buf, ctypes.byref(size))
+        if ret != _ERROR_BUFFER_OVERFLOW:
+            break
+    if ret != 0:
+        raise OSError(ret, "GetAdaptersAddresses failed")
+    
+    interfaces = []
+    adapter = ctypes.cast(buf, ctypes.POINTER(IP_ADAPTER_ADDRESSES))
+    while adapter:
+        info = adapter.contents
+        if info.IfType == _IF_TYPE_SOFTWARE_LOOPBACK:
+            adapter = info.Next
+            continue
+        
+        ip = None
+        unicast = info.FirstUnicastAddress
+        while unicast:
+            address = unicast.contents.Address
+            sockaddr = ctypes.string_at(address.lpSockaddr, address.iSockaddrLength)
+            if int.from_bytes(sockaddr[:2], 'little') == _AF_INET:
+                ip = '.'.join(str(octet) for octet in sockaddr[4:8])
+                break
+            unicast = unicast.contents.Next
+        
+        interfaces.append({
+            'name': info.FriendlyName,
+            'ip': ip,
+            'type': _IF_TYPES.get(info.IfType, 'unknown')
+        })
+        adapter = info.Next
+    
+    return interfaces
+
+
+@_ttl_cache(_PROBE_CACHE_TTL)
 def get_windows_network_interfaces() -> List[Dict[str, str]]:
     """Get network interface information on Windows."""
     interfaces = []
     
-    if not is_windows():
+    if not _IS_WINDOWS:
         return interfaces
     
+    try:
+        return _get_adapters_via_iphlpapi()
+    except Exception as e:
+        logging.debug(f"GetAdaptersAddresses failed, falling back to ipconfig: {e}")
+    
     try:
         # Use ipconfig to get interface information
         result = subprocess.run(
@@ -217,21 +421,22 @@ def get_windows_network_interfaces() -> List[Dict[str, str]]:
         )
         
         if result.returncode == 0:
-            # Parse ipconfig output for interface information
+            # Parse ipconfig output for interface information; only lines
+            # the parser cares about are matched, all in one regex pass
             current_interface = {}
-            for line in result.stdout.split('\n'):
-                line = line.strip()
-                if 'adapter' in line.lower() and ':' in line:
+            for match in _IPCONFIG_LINE_RE.finditer(result.stdout):
+                kind = match.lastgroup
+                if kind == 'hdr':
                     if current_interface:
                         interfaces.append(current_interface)
-                    current_interface = {'name': line, 'ip': None, 'type': 'unknown'}
-                elif 'IPv4 Address' in line:
-                    ip_match = line.split(':')[-1].strip()
+                    current_interface = {'name': match.group('hdr').strip(), 'ip': None, 'type': 'unknown'}
+                elif kind == 'ip':
+                    ip_match = match.group('ip').strip()
                     if ip_match:
                         current_interface['ip'] = ip_match.split('(')[0].strip()
-                elif 'ethernet' in line.lower():
+                elif kind == 'eth':
                     current_interface['type'] = 'ethernet'
-                elif 'wireless' in line.lower() or 'wi-fi' in line.lower():
+                else:
                     current_interface['type'] = 'wifi'
             
             if current_interface:
@@ -245,7 +450,7 @@ def get_windows_network_interfaces() -> List[Dict[str, str]]:
 
 def setup_windows_console() -> None:
     """Setup Windows console for better display."""
-    if not is_windows():
+    if not _IS_WINDOWS:
         return
     
     try:
@@ -257,57 +462,40 @@ def setup_windows_console() -> None:
         pass
 
 
+@_ttl_cache(_PROBE_CACHE_TTL)
 def check_windows_dependencies() -> Dict[str, bool]:
     """Check Windows-specific dependencies."""
-    dependencies = {
-        "pywin32": False,
-        "paramiko": False,
-        "customtkinter": False,
-        "requests": False
+    # Dependency name -> importable module that provides it
+    modules = {
+        "pywin32": "win32api",
+        "paramiko": "paramiko",
+        "customtkinter": "customtkinter",
+        "requests": "requests"
     }
     
-    # Check each dependency
-    for dep in dependencies:
-        try:
-            __import__(dep)
-            dependencies[dep] = True
-        except ImportError:
-            dependencies[dep] = False
-    
-    return dependencies
+    # find_spec locates each module without executing it
+    return {dep: importlib.util.find_spec(module) is not None for dep, module in modules.items()}
 
 
+@lru_cache(maxsize=1)
 def get_windows_ssh_client_path() -> Optional[str]:
     """Get path to Windows SSH client if available."""
-    if not is_windows():
+    if not _IS_WINDOWS:
         return None
     
     # Check for OpenSSH in Windows
-    possible_paths = [
-        r"C:\Windows\System32\OpenSSH\ssh.exe",
-        r"C:\Program Files\OpenSSH\ssh.exe",
-        r"C:\Program Files (x86)\OpenSSH\ssh.exe"
-    ]
-    
-    for path in possible_paths:
-        if Path(path).exists():
+    for path in _OPENSSH_CLIENT_PATHS:
+        if os.path.isfile(path):
             return path
     
-    # Check PATH
-    try:
-        result = subprocess.run(["where", "ssh"], capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            return result.stdout.strip().split('\n')[0]
-    except Exception:
-        pass
-    
-    return None
+    # Check PATH (honours PATHEXT, like 'where')
+    return shutil.which("ssh")
 
 
 def create_windows_shortcut(target_path: str, shortcut_path: str, 
                            description: str = "", icon_path: str = "") -> bool:
     """Create a Windows shortcut."""
-    if not is_windows() or not WINDOWS_MODULES_AVAILABLE:
+    if not _IS_WINDOWS or not WINDOWS_MODULES_AVAILABLE:
         return False
     
     try:
@@ -338,7 +526,7 @@ def test_windows_compatibility() -> Dict[str, Any]:
         "is_windows": is_windows(),
         "is_admin": is_admin(),
         "windows_modules": WINDOWS_MODULES_AVAILABLE,
-        "ssh_support": check_windows_ssh_support(),
+        "ssh_support": check_windows_ssh_support(full=True),
         "dependencies": check_windows_dependencies(),
         "ssh_client_path": get_windows_ssh_client_path(),
         "config_dir": str(get_platform_config_dir("remarkable-xovi-installer")),